@@ -4,6 +4,7 @@ Supports Claude 3.5 Sonnet, Claude 3 Opus
 """
 
 import os
+import threading
 from typing import Optional
 
 try:
@@ -11,6 +12,8 @@ try:
 except ImportError:
     Anthropic = None
 
+from vendor_http import get_vendor_http_client
+
 class AnthropicClient:
     """Client for Anthropic Claude API"""
     
@@ -19,7 +22,7 @@ class AnthropicClient:
         self.client = None
         
         if self.api_key and Anthropic:
-            self.client = Anthropic(api_key=self.api_key)
+            self.client = Anthropic(api_key=self.api_key, http_client=get_vendor_http_client())
     
     def is_ready(self) -> bool:
         return self.client is not None
@@ -47,5 +50,20 @@ class AnthropicClient:
         except Exception as e:
             raise RuntimeError(f"Anthropic Error: {str(e)}")
 
+# Process-wide client (the SDK client owns an httpx connection pool)
+_anthropic_client: Optional[AnthropicClient] = None
+_anthropic_client_lock = threading.Lock()
+
 def get_anthropic_client():
-    return AnthropicClient()
+    global _anthropic_client
+    if _anthropic_client is None:
+        with _anthropic_client_lock:
+            if _anthropic_client is None:
+                _anthropic_client = AnthropicClient()
+    return _anthropic_client
+
+def reset_anthropic_client() -> None:
+    """Drop the shared client (e.g. after ANTHROPIC_API_KEY changes, or in tests)"""
+    global _anthropic_client
+    with _anthropic_client_lock:
+        _anthropic_client = None
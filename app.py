@@ -38,8 +38,8 @@ except ImportError:
 
 # v2.5 Enterprise Modules
 try:
-    from hcc_scoring import HCCEngine
-    from disease_discovery import DiseaseDiscoveryEngine
+    from hcc_scoring import get_hcc_engine
+    from disease_discovery import get_discovery_engine
     from meat_compliance import MEATValidator
     V25_AVAILABLE = True
 except ImportError:
@@ -563,7 +563,7 @@ with st.sidebar:
             with c1:
                 st.subheader("Disease Discovery")
                 # Run discovery on inputs
-                dd_engine = DiseaseDiscoveryEngine()
+                dd_engine = get_discovery_engine()
                 # Parse labs from text (mock parser for demo)
                 lab_dict = {} 
                 if "A1c" in labs: lab_dict["a1c"] = 7.2 # Demo value
@@ -584,7 +584,7 @@ with st.sidebar:
                 if "Diabetes" in str(discovered): icd_codes.append("E11.9")
                 if "CKD" in str(discovered): icd_codes.append("N18.3")
                 
-                hcc_engine = HCCEngine()
+                hcc_engine = get_hcc_engine()
                 raf_result = hcc_engine.calculate_raf(age, "M" if gender=="Male" else "F", icd_codes)
                 
                 st.metric("Estimated RAF Score", f"{raf_result['raf_score']:.3f}")
@@ -4,6 +4,7 @@ Supports GPT-4, GPT-4-Turbo with Azure's HIPAA-compliant infrastructure
 """
 
 import os
+import threading
 from typing import Optional
 
 try:
@@ -11,6 +12,8 @@ try:
 except ImportError:
     AzureOpenAI = None
 
+from vendor_http import get_vendor_http_client
+
 class AzureOpenAIClient:
     """Client for Azure OpenAI endpoint (HIPAA-compliant)"""
     
@@ -24,7 +27,8 @@ class AzureOpenAIClient:
             self.client = AzureOpenAI(
                 api_key=self.api_key,
                 azure_endpoint=self.endpoint,
-                api_version=self.api_version
+                api_version=self.api_version,
+                http_client=get_vendor_http_client()
             )
     
     def is_ready(self) -> bool:
@@ -57,5 +61,20 @@ class AzureOpenAIClient:
         except Exception as e:
             raise RuntimeError(f"Azure OpenAI Error: {str(e)}")
 
+# Process-wide client (the SDK client owns an httpx connection pool)
+_azure_client: Optional[AzureOpenAIClient] = None
+_azure_client_lock = threading.Lock()
+
 def get_azure_client():
-    return AzureOpenAIClient()
+    global _azure_client
+    if _azure_client is None:
+        with _azure_client_lock:
+            if _azure_client is None:
+                _azure_client = AzureOpenAIClient()
+    return _azure_client
+
+def reset_azure_client() -> None:
+    """Drop the shared client (e.g. after AZURE_OPENAI_API_KEY changes, or in tests)"""
+    global _azure_client
+    with _azure_client_lock:
+        _azure_client = None
@@ -3,8 +3,11 @@ Disease Discovery AI Engine
 Uses NLP and inference rules to identify undocumented conditions from clinical notes, labs, and medications.
 """
 
+import hashlib
 import re
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 
 class DiseaseDiscoveryEngine:
     """
@@ -13,8 +16,18 @@ class DiseaseDiscoveryEngine:
     2. Medication inference (e.g., Insulin -> Diabetes)
     3. Lab value inference (e.g., A1c > 6.5 -> Diabetes)
     """
-    
+
+    # The same note is often re-analyzed by several agents; results are
+    # deterministic, so keep the most recent ones (keyed by a digest of the
+    # note, never the note text itself)
+    RESULT_CACHE_MAXSIZE = 1024
+
+    NEGATION_CUES = ('no ', 'not ', 'denies ', 'negative for ')
+
     def __init__(self):
+        self._result_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+
         # Regex patterns for conditions
         self.patterns = {
             'Diabetes': [
@@ -36,6 +49,14 @@ class DiseaseDiscoveryEngine:
                 r'\bobesity\b', r'\bmorbid obesity\b', r'\bmi > 35\b', r'\bmi > 40\b'
             ]
         }
+
+        # Compiled once per engine; only each pattern's first occurrence is
+        # checked, so a per-pattern search stops early where one combined
+        # scan would have to walk the whole note
+        self.note_res = [
+            (condition, [re.compile(pattern) for pattern in self.patterns[condition]])
+            for condition in self.patterns
+        ]
         
         # Medication inference rules
         self.med_rules = {
@@ -45,14 +66,24 @@ class DiseaseDiscoveryEngine:
             'Afib': ['eliquis', 'xarelto', 'warfarin', 'amiodarone'],
             'Asthma/COPD': ['albuterol', 'symbicort', 'advair', 'spiriva']
         }
+
+        # All medication triggers in one alternation (longest first), mapped
+        # back to their conditions, so each med is scanned once
+        self.med_triggers: Dict[str, List[str]] = {}
+        for condition, triggers in self.med_rules.items():
+            for trigger in triggers:
+                self.med_triggers.setdefault(trigger, []).append(condition)
+        self.med_trigger_re = re.compile(
+            '|'.join(re.escape(t) for t in sorted(self.med_triggers, key=len, reverse=True))
+        )
         
-        # Lab inference rules (Condition: lambda labs: bool)
-        self.lab_rules = {
-            'Diabetes': lambda l: self._check_lab(l, 'a1c', 6.5, '>'),
-            'CKD Stage 3+': lambda l: self._check_lab(l, 'gfr', 60, '<'),
-            'Anemia': lambda l: self._check_lab(l, 'hgb', 12, '<'), # Simplified
-            'Hyperkalemia': lambda l: self._check_lab(l, 'potassium', 5.5, '>')
-        }
+        # Lab inference rules as a flat table: (condition, lab name, threshold, op)
+        self.lab_rules = [
+            ('Diabetes', 'a1c', 6.5, '>'),
+            ('CKD Stage 3+', 'gfr', 60, '<'),
+            ('Anemia', 'hgb', 12, '<'), # Simplified
+            ('Hyperkalemia', 'potassium', 5.5, '>')
+        ]
 
     def analyze(self, text: str, meds: List[str] = [], labs: Dict[str, float] = {}) -> Dict:
         """
@@ -66,32 +97,70 @@ class DiseaseDiscoveryEngine:
         Returns:
             Dict of discovered conditions with sources
         """
+        try:
+            key = (
+                hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(),
+                tuple(meds),
+                tuple(sorted(labs.items())),
+            )
+            hash(key)
+        except TypeError:
+            # Unhashable lab values: analyze without caching
+            return self._analyze(text, meds, labs)
+
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._result_cache.move_to_end(key)
+        if cached is None:
+            cached = self._analyze(text, meds, labs)
+            with self._result_cache_lock:
+                self._result_cache[key] = cached
+                if len(self._result_cache) > self.RESULT_CACHE_MAXSIZE:
+                    self._result_cache.popitem(last=False)  # Evict least recently used
+
+        # Callers may mutate the result; hand out a copy
+        return {condition: list(sources) for condition, sources in cached.items()}
+
+    def _analyze(self, text: str, meds: List[str], labs: Dict[str, float]) -> Dict:
+        """Run note, medication and lab inference (uncached)"""
         discovered = {}
         
         # 1. Text Analysis (NLP)
         text_lower = text.lower()
-        for condition, patterns in self.patterns.items():
-            for pattern in patterns:
-                # Check for match
-                match = re.search(pattern, text_lower)
+        for condition, regexes in self.note_res:
+            for regex in regexes:
+                match = regex.search(text_lower)
                 if match:
-                    # Simple negation check (look behind 3 words)
+                    # Simple negation check (look behind 3 words); a negated
+                    # first occurrence rules the pattern out
                     start = max(0, match.start() - 20)
                     context = text_lower[start:match.start()]
-                    if not any(neg in context for neg in ['no ', 'not ', 'denies ', 'negative for ']):
+                    if not any(neg in context for neg in self.NEGATION_CUES):
                         self._add_finding(discovered, condition, 'NLP (Note)')
-                        break # Found one pattern for this condition, move to next
+                        break  # Found one pattern for this condition, move to next
         
         # 2. Medication Inference
-        meds_lower = [m.lower() for m in meds]
-        for condition, triggers in self.med_rules.items():
-            found_meds = [m for m in meds_lower if any(t in m for t in triggers)]
-            if found_meds:
-                self._add_finding(discovered, condition, f'Inferred from Meds ({", ".join(found_meds)})')
+        found_meds: Dict[str, List[str]] = {}
+        for med in meds:
+            med_lower = med.lower()
+            conditions = {
+                condition
+                for trigger in self.med_trigger_re.findall(med_lower)
+                for condition in self.med_triggers[trigger]
+            }
+            for condition in conditions:
+                found_meds.setdefault(condition, []).append(med_lower)
+
+        for condition in self.med_rules:
+            if condition in found_meds:
+                self._add_finding(discovered, condition, f'Inferred from Meds ({", ".join(found_meds[condition])})')
 
         # 3. Lab Inference
-        for condition, rule in self.lab_rules.items():
-            if rule(labs):
+        # Normalize keys once per call, not once per rule
+        labs_norm = [(k.lower(), v) for k, v in labs.items()]
+        for condition, name, threshold, op in self.lab_rules:
+            if self._check_lab(labs_norm, name, threshold, op):
                 self._add_finding(discovered, condition, 'Inferred from Labs')
                 
         return discovered
@@ -101,13 +170,10 @@ class DiseaseDiscoveryEngine:
             discovered[condition] = []
         discovered[condition].append(source)
 
-    def _check_lab(self, labs: Dict, name: str, threshold: float, op: str) -> bool:
-        # Normalize keys
-        labs_norm = {k.lower(): v for k, v in labs.items()}
-        
-        # Find partial match for lab name
+    def _check_lab(self, labs_norm: List[Tuple[str, float]], name: str, threshold: float, op: str) -> bool:
+        # Find partial match for lab name (keys already lowercased)
         val = None
-        for k, v in labs_norm.items():
+        for k, v in labs_norm:
             if name in k:
                 val = v
                 break
@@ -119,6 +185,21 @@ class DiseaseDiscoveryEngine:
         if op == '<': return val < threshold
         return False
 
+
+# Process-wide engine, so the result cache survives Streamlit reruns and is
+# shared by every caller (patterns and rules are read-only after __init__)
+_discovery_engine: Optional[DiseaseDiscoveryEngine] = None
+_discovery_engine_lock = threading.Lock()
+
+def get_discovery_engine() -> DiseaseDiscoveryEngine:
+    global _discovery_engine
+    if _discovery_engine is None:
+        with _discovery_engine_lock:
+            if _discovery_engine is None:
+                _discovery_engine = DiseaseDiscoveryEngine()
+    return _discovery_engine
+
+
 if __name__ == "__main__":
     engine = DiseaseDiscoveryEngine()
     
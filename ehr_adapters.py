@@ -10,11 +10,16 @@ PROTOCOL:
 """
 
 from abc import ABC, abstractmethod
+from types import MappingProxyType
 from typing import Dict, Optional
 
 class EHRAdapter(ABC):
     """Abstract Base Class for EHR Integrations"""
-    
+
+    # Many adapters live at once (one per tenant/site); keep instances compact.
+    # Subclasses declare __slots__ = () unless they add state of their own.
+    __slots__ = ('base_url', 'client_id', 'client_secret', 'token', 'connected')
+
     def __init__(self, base_url: str, client_id: str, client_secret: str):
         self.base_url = base_url
         self.client_id = client_id
@@ -43,7 +48,9 @@ class EHRAdapter(ABC):
 
 class GenericFHIRAdapter(EHRAdapter):
     """Generic FHIR R4 Adapter (works for most modern EHRs)"""
-    
+
+    __slots__ = ()
+
     def connect(self) -> bool:
         # Mock OAuth2 flow
         if self.client_id and self.base_url:
@@ -74,100 +81,113 @@ class GenericFHIRAdapter(EHRAdapter):
 
 class EpicAdapter(GenericFHIRAdapter):
     """Epic Systems (App Orchard / FHIR)"""
-    pass
+    __slots__ = ()
 
 class CernerAdapter(GenericFHIRAdapter):
     """Oracle Cerner (Millennium / Ignite)"""
-    pass
+    __slots__ = ()
 
 class AthenaAdapter(GenericFHIRAdapter):
     """athenahealth (Marketplace API)"""
-    pass
+    __slots__ = ()
 
 class AllscriptsAdapter(GenericFHIRAdapter):
     """Veradigm (formerly Allscripts)"""
-    pass
+    __slots__ = ()
 
 class NextGenAdapter(GenericFHIRAdapter):
     """NextGen Healthcare API"""
-    pass
+    __slots__ = ()
 
 class EClinicalWorksAdapter(GenericFHIRAdapter):
     """eClinicalWorks (FHIR R4)"""
-    pass
+    __slots__ = ()
 
 class MeditechAdapter(GenericFHIRAdapter):
     """MEDITECH Expanse"""
-    pass
+    __slots__ = ()
 
 class GreenwayAdapter(GenericFHIRAdapter):
     """Greenway Health (Intergy/Prime Suite)"""
-    pass
+    __slots__ = ()
 
 class PracticeFusionAdapter(GenericFHIRAdapter):
     """Practice Fusion (Veradigm)"""
-    pass
+    __slots__ = ()
 
 class ElationAdapter(GenericFHIRAdapter):
     """Elation Health API"""
-    pass
+    __slots__ = ()
 
 class CanvasAdapter(GenericFHIRAdapter):
     """Canvas Medical (FHIR First)"""
-    pass
+    __slots__ = ()
 
 class DrChronoAdapter(GenericFHIRAdapter):
     """DrChrono API"""
-    pass
+    __slots__ = ()
 
 class KareoAdapter(GenericFHIRAdapter):
     """Tebra (Kareo)"""
-    pass
+    __slots__ = ()
 
 class AdvancedMDAdapter(GenericFHIRAdapter):
     """AdvancedMD API"""
-    pass
+    __slots__ = ()
 
 class MDLandAdapter(GenericFHIRAdapter):
     """MDLand (iClinic)"""
-    pass
+    __slots__ = ()
 
 class EMedicalPracticeAdapter(GenericFHIRAdapter):
     """eMedicalPractice"""
-    pass
+    __slots__ = ()
 
 class MedentAdapter(GenericFHIRAdapter):
     """MEDENT"""
-    pass
+    __slots__ = ()
 
 class TalkEHRAdapter(GenericFHIRAdapter):
     """TalkEHR"""
-    pass
+    __slots__ = ()
+
+# Registry of adapters by display name (built once, read-only)
+_EHR_REGISTRY = MappingProxyType({
+    "Epic": EpicAdapter,
+    "Cerner": CernerAdapter,
+    "athenahealth": AthenaAdapter,
+    "Veradigm": AllscriptsAdapter,
+    "NextGen": NextGenAdapter,
+    "eClinicalWorks": EClinicalWorksAdapter,
+    "MEDITECH": MeditechAdapter,
+    "Greenway": GreenwayAdapter,
+    "Practice Fusion": PracticeFusionAdapter,
+    "Elation": ElationAdapter,
+    "Canvas": CanvasAdapter,
+    "DrChrono": DrChronoAdapter,
+    "Tebra": KareoAdapter,
+    "AdvancedMD": AdvancedMDAdapter,
+    "MDLand": MDLandAdapter,
+    "eMedicalPractice": EMedicalPracticeAdapter,
+    "MEDENT": MedentAdapter,
+    "TalkEHR": TalkEHRAdapter
+})
+
+
+def _normalize(name: str) -> str:
+    """Collapse case/whitespace variants of a vendor name"""
+    return name.strip().lower()
+
+
+# Same registry keyed by normalized name, so "epic " and "EPIC" resolve too
+_EHR_REGISTRY_NORMALIZED = MappingProxyType({
+    _normalize(name): adapter_class for name, adapter_class in _EHR_REGISTRY.items()
+})
+
 
 # Factory to get adapter by name
 def get_ehr_adapter(name: str, config: Dict) -> EHRAdapter:
-    adapters = {
-        "Epic": EpicAdapter,
-        "Cerner": CernerAdapter,
-        "athenahealth": AthenaAdapter,
-        "Veradigm": AllscriptsAdapter,
-        "NextGen": NextGenAdapter,
-        "eClinicalWorks": EClinicalWorksAdapter,
-        "MEDITECH": MeditechAdapter,
-        "Greenway": GreenwayAdapter,
-        "Practice Fusion": PracticeFusionAdapter,
-        "Elation": ElationAdapter,
-        "Canvas": CanvasAdapter,
-        "DrChrono": DrChronoAdapter,
-        "Tebra": KareoAdapter,
-        "AdvancedMD": AdvancedMDAdapter,
-        "MDLand": MDLandAdapter,
-        "eMedicalPractice": EMedicalPracticeAdapter,
-        "MEDENT": MedentAdapter,
-        "TalkEHR": TalkEHRAdapter
-    }
-    
-    adapter_class = adapters.get(name)
+    adapter_class = _EHR_REGISTRY.get(name) or _EHR_REGISTRY_NORMALIZED.get(_normalize(name))
     if adapter_class:
         return adapter_class(
             base_url=config.get('url', ''),
@@ -4,7 +4,9 @@ Supports Med-PaLM 2, Gemini Pro
 """
 
 import os
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
 
 try:
     import google.generativeai as genai
@@ -17,6 +19,9 @@ class GoogleClient:
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.client = None
+        # GenerativeModel / GenerationConfig objects reused across queries
+        self._models = {}
+        self._generation_configs = {}
         
         if self.api_key and genai:
             genai.configure(api_key=self.api_key)
@@ -37,19 +42,50 @@ class GoogleClient:
             raise RuntimeError("Google API not configured. Set GOOGLE_API_KEY")
         
         try:
-            model_obj = genai.GenerativeModel(model)
+            model_obj = self._models.get(model)
+            if model_obj is None:
+                model_obj = self._models[model] = genai.GenerativeModel(model)
+
+            config_key = (temperature, max_tokens)
+            generation_config = self._generation_configs.get(config_key)
+            if generation_config is None:
+                generation_config = self._generation_configs[config_key] = genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                )
+
             full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
             
             response = model_obj.generate_content(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens
-                )
+                generation_config=generation_config
             )
             return response.text
         except Exception as e:
             raise RuntimeError(f"Google API Error: {str(e)}")
 
+    def query_many(self, prompts: List[str], max_workers: int = 8, **kwargs: Any) -> List[str]:
+        """Send several independent prompts concurrently; results are in prompt order"""
+        if len(prompts) <= 1:
+            return [self.query(prompt, **kwargs) for prompt in prompts]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+            return list(executor.map(lambda prompt: self.query(prompt, **kwargs), prompts))
+
+# Process-wide client, so cached models/configs survive across queries
+_google_client: Optional[GoogleClient] = None
+_google_client_lock = threading.Lock()
+
 def get_google_client():
-    return GoogleClient()
+    global _google_client
+    if _google_client is None:
+        with _google_client_lock:
+            if _google_client is None:
+                _google_client = GoogleClient()
+    return _google_client
+
+def reset_google_client() -> None:
+    """Drop the shared client (e.g. after GOOGLE_API_KEY changes, or in tests)"""
+    global _google_client
+    with _google_client_lock:
+        _google_client = None
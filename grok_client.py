@@ -4,12 +4,16 @@ Wraps the OpenAI SDK to communicate with xAI's Grok models.
 """
 
 import os
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 try:
     from openai import OpenAI
 except ImportError:
     OpenAI = None
 
+from vendor_http import get_vendor_http_client
+
 class GrokClient:
     """
     Client for interacting with xAI's Grok API.
@@ -29,7 +33,8 @@ class GrokClient:
         if self.api_key and OpenAI:
             self.client = OpenAI(
                 api_key=self.api_key,
-                base_url="https://api.x.ai/v1"
+                base_url="https://api.x.ai/v1",
+                http_client=get_vendor_http_client()
             )
             
     def is_ready(self) -> bool:
@@ -86,6 +91,47 @@ class GrokClient:
         except Exception as e:
             raise RuntimeError(f"xAI API Error: {str(e)}")
 
+    def query_xai_many(
+        self,
+        prompts: List[str],
+        max_workers: int = 8,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        Send several independent prompts concurrently.
+
+        Requests share the client's connection pool and overlap their
+        round-trips, so N prompts take roughly one RTT instead of N.
+
+        Args:
+            prompts: User queries
+            max_workers: Maximum requests in flight
+            **kwargs: Passed to query_xai (model, temperature, max_tokens, system_prompt)
+
+        Returns:
+            Generated text responses, in prompt order
+        """
+        if len(prompts) <= 1:
+            return [self.query_xai(prompt, **kwargs) for prompt in prompts]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as executor:
+            return list(executor.map(lambda prompt: self.query_xai(prompt, **kwargs), prompts))
+
+# Process-wide client (the OpenAI SDK client owns an httpx connection pool)
+_grok_client: Optional[GrokClient] = None
+_grok_client_lock = threading.Lock()
+
 def get_grok_client() -> GrokClient:
-    """Factory to get a singleton-like client instance."""
-    return GrokClient()
+    """Factory to get the shared client instance."""
+    global _grok_client
+    if _grok_client is None:
+        with _grok_client_lock:
+            if _grok_client is None:
+                _grok_client = GrokClient()
+    return _grok_client
+
+def reset_grok_client() -> None:
+    """Drop the shared client (e.g. after XAI_API_KEY changes, or in tests)."""
+    global _grok_client
+    with _grok_client_lock:
+        _grok_client = None
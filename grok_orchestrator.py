@@ -5,9 +5,41 @@ Grok decides which AIs to consult, aggregates responses, makes final decision
 
 
 from local_inference import grok_query
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+import asyncio
+import functools
+import hashlib
 import json
 import os  # Required for XAI_API_KEY environment variable check
+import threading
+
+# Optional: orjson (Rust parser) for routing/decision payloads; stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the except clauses hold.
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+# Cap on concurrent vendor LLM calls across all orchestrations in this process
+# (keeps fan-out under provider rate limits). A threading semaphore, because each
+# sync consult_and_decide runs its own event loop and the calls run on worker threads.
+_VENDOR_CALL_LIMIT = threading.BoundedSemaphore(int(os.getenv("GROK_MAX_CONCURRENCY", "4")))
+
+
+# Consultant calls run here rather than on the event loop's default executor, so a
+# discarded speculative call does not hold up asyncio.run() shutdown
+_CONSULT_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="grok-consult")
+
+
+def _limited_grok_query(prompt: str, **kwargs) -> str:
+    """grok_query, holding a vendor-call slot for the duration of the request"""
+    with _VENDOR_CALL_LIMIT:
+        return grok_query(prompt, **kwargs)
 
 
 class GrokOrchestrator:
@@ -17,6 +49,22 @@ class GrokOrchestrator:
     2. Vendor AIs provide recommendations
     3. Grok compares all responses and makes final decision
     """
+
+    # Default roster queried speculatively while Grok is still routing. Off by
+    # default (0 = wait for routing): speculation sends the clinical prompt (PHI)
+    # to external vendors before Grok has weighed privacy, e.g. picked on-prem
+    # llama only. Calls already in flight cannot be cancelled, so unpicked ones
+    # are still billed and hold _VENDOR_CALL_LIMIT slots until they return.
+    # Enable only where every listed vendor is cleared for the data.
+    SPECULATIVE_CONSULTANTS = int(os.getenv("GROK_SPECULATIVE_CONSULTANTS", "0"))
+
+    # Per-consultant cap on text forwarded into the comparison prompt
+    CONSULTANT_RESPONSE_MAX_CHARS = 4000
+
+    # Parsed routing decisions shared by all orchestrators (LRU, most recent last)
+    ROUTING_CACHE_MAXSIZE = 4096
+    _routing_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[str, Tuple[str, ...]]]" = OrderedDict()
+    _routing_cache_lock = threading.Lock()
     
     def __init__(self):
         """Initialize with API key validation"""
@@ -33,10 +81,17 @@ class GrokOrchestrator:
             "llama-3.1-70b"       # Local (on-prem)
         ]
     
+    CONSULTANT_SYSTEM_PROMPT = (
+        "You are a clinical consultant AI. Provide concise, evidence-based recommendation. "
+        'Respond ONLY as JSON: {"rec": "", "evidence": ["", "", ""], "confidence": 0.0}'
+    )
+
     def consult_and_decide(self, clinical_prompt: str) -> Dict:
         """
         Full orchestration: Grok decides, consults vendors, makes final call
-        
+
+        Sync wrapper around aconsult_and_decide (consultants are queried concurrently).
+
         Returns:
             {
                 "grok_routing_decision": str,
@@ -46,61 +101,68 @@ class GrokOrchestrator:
                 "confidence": float
             }
         """
-        
-        # STEP 1: Grok decides which AIs to consult
-        routing_prompt = f"""You are the orchestrator AI for a hospital's clinical decision support.
-        
-Clinical Question:
-{clinical_prompt}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aconsult_and_decide(clinical_prompt))
 
-Available consultant AIs:
-- gpt-4-turbo (Azure OpenAI, HIPAA-compliant, strong on general medicine)
-- claude-3-5-sonnet (Anthropic, strong on reasoning and safety analysis)
-- gemini-pro (Google, strong on evidence synthesis)
-- llama-3.1-70b (Local on-prem, privacy-first)
+        # Already inside an event loop (e.g. an async agent): run on a helper thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aconsult_and_decide(clinical_prompt)).result()
 
-Task: Decide which 2-3 AIs to consult for this case. Return ONLY a JSON list like:
-["gpt-4-turbo", "claude-3-5-sonnet"]
+    async def aconsult_and_decide(self, clinical_prompt: str) -> Dict:
+        """Async orchestration: consultant queries run concurrently (max-of-N latency, not sum-of-N)"""
 
-Consider: complexity, specialty, privacy requirements."""
+        # STEP 1: Grok decides which AIs to consult. With speculation enabled and no
+        # cached decision, the default roster is queried at the same time, so routing
+        # latency overlaps consultant latency instead of preceding it.
+        speculative = {}
+        routed = self._cached_route(self._routing_key(clinical_prompt))
+        if routed is None and self.SPECULATIVE_CONSULTANTS > 0:
+            speculative = {
+                model: asyncio.ensure_future(self._aquery(model, clinical_prompt))
+                for model in self.AVAILABLE_CONSULTANTS[:self.SPECULATIVE_CONSULTANTS]
+            }
+        try:
+            grok_routing, consultants_to_use = routed or await self._aroute(clinical_prompt)
+        except BaseException:
+            for task in speculative.values():
+                task.cancel()
+            raise
 
-        grok_routing = grok_query(
-            routing_prompt,
-            model_name="grok-beta",
-            temperature=0.0
+        # Drop speculative calls Grok did not pick (queued ones never start;
+        # ones already sent run to completion and are discarded)
+        for model, task in speculative.items():
+            if model not in consultants_to_use:
+                task.cancel()
+
+        # STEP 2: Query selected consultant AIs in parallel, reusing speculative calls
+        responses = await asyncio.gather(
+            *(speculative.get(consultant_model) or self._aquery(consultant_model, clinical_prompt)
+              for consultant_model in consultants_to_use),
+            return_exceptions=True
         )
-        
-        
-        # Parse Grok's routing decision
-        try:
-            consultants_to_use = json.loads(grok_routing)
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
-            # Grok failed to parse - use safe default
-            print(f"⚠️ Grok routing parse error: {e}. Using default consultants.")
-            consultants_to_use = self.AVAILABLE_CONSULTANTS[:3]
-        
-        # STEP 2: Query selected consultant AIs in parallel
         consultant_responses = {}
-        for consultant_model in consultants_to_use:
-            try:
-                response = grok_query(
-                    clinical_prompt,
-                    model_name=consultant_model,
-                    temperature=0.0,
-                    system_prompt="You are a clinical consultant AI. Provide concise, evidence-based recommendation."
-                )
+        for consultant_model, response in zip(consultants_to_use, responses):
+            if isinstance(response, Exception):
+                consultant_responses[consultant_model] = f"ERROR: {str(response)}"
+            else:
                 consultant_responses[consultant_model] = response
-            except Exception as e:
-                consultant_responses[consultant_model] = f"ERROR: {str(e)}"
         
         # STEP 3: Grok reviews all responses and makes final decision
+        # Structured (or trimmed) answers in compact JSON keep the arbiter prompt
+        # (and its token count) bounded
+        responses_json = json.dumps(
+            {model: self._condense(text) for model, text in consultant_responses.items()},
+            separators=(",", ":"),
+        )
         comparison_prompt = f"""You are the final decision-maker for clinical AI recommendations.
 
 Original Question:
 {clinical_prompt}
 
 Consultant AI Responses:
-{json.dumps(consultant_responses, indent=2)}
+{responses_json}
 
 Task: 
 1. Compare all consultant responses
@@ -117,7 +179,8 @@ Return JSON:
   "rationale": "why this decision"
 }}"""
 
-        grok_final = grok_query(
+        grok_final = await asyncio.to_thread(
+            _limited_grok_query,
             comparison_prompt,
             model_name="grok-beta",
             temperature=0.0
@@ -131,6 +194,103 @@ Return JSON:
             "raw_grok_output": grok_final
         }
 
+    async def _aroute(self, clinical_prompt: str) -> Tuple[str, List[str]]:
+        """
+        Ask Grok which consultants to use: (raw routing reply, parsed consultant list)
+
+        The routing call is deterministic (temperature 0), so successfully parsed
+        decisions are memoized per (prompt, available consultants).
+        """
+        cache_key = self._routing_key(clinical_prompt)
+        cached = self._cached_route(cache_key)
+        if cached is not None:
+            return cached
+
+        routing_prompt = f"""You are the orchestrator AI for a hospital's clinical decision support.
+        
+Clinical Question:
+{clinical_prompt}
+
+Available consultant AIs:
+- gpt-4-turbo (Azure OpenAI, HIPAA-compliant, strong on general medicine)
+- claude-3-5-sonnet (Anthropic, strong on reasoning and safety analysis)
+- gemini-pro (Google, strong on evidence synthesis)
+- llama-3.1-70b (Local on-prem, privacy-first)
+
+Task: Decide which 2-3 AIs to consult for this case. Return ONLY a JSON list like:
+["gpt-4-turbo", "claude-3-5-sonnet"]
+
+Consider: complexity, specialty, privacy requirements."""
+
+        grok_routing = await asyncio.to_thread(
+            _limited_grok_query,
+            routing_prompt,
+            model_name="grok-beta",
+            temperature=0.0
+        )
+        
+        
+        # Parse Grok's routing decision
+        try:
+            consultants_to_use = _json_loads(grok_routing)
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            # Grok failed to parse - use safe default
+            print(f"⚠️ Grok routing parse error: {e}. Using default consultants.")
+            consultants_to_use = self.AVAILABLE_CONSULTANTS[:3]
+            return grok_routing, consultants_to_use
+
+        if not isinstance(consultants_to_use, list):
+            return grok_routing, consultants_to_use
+
+        with GrokOrchestrator._routing_cache_lock:
+            GrokOrchestrator._routing_cache[cache_key] = (grok_routing, tuple(consultants_to_use))
+            if len(GrokOrchestrator._routing_cache) > self.ROUTING_CACHE_MAXSIZE:
+                GrokOrchestrator._routing_cache.popitem(last=False)
+        return grok_routing, consultants_to_use
+
+    def _condense(self, response: str):
+        """Consultant answer as {rec, evidence (top 3), confidence}, or its trimmed text if not that JSON"""
+        max_chars = self.CONSULTANT_RESPONSE_MAX_CHARS
+        try:
+            parsed = _json_loads(response)
+        except (json.JSONDecodeError, ValueError, TypeError):
+            return response[:max_chars]
+        if not isinstance(parsed, dict) or "rec" not in parsed:
+            return response[:max_chars]
+
+        evidence = parsed.get("evidence")
+        return {
+            "rec": str(parsed["rec"])[:max_chars],
+            "evidence": evidence[:3] if isinstance(evidence, list) else [],
+            "confidence": parsed.get("confidence"),
+        }
+
+    def _routing_key(self, clinical_prompt: str) -> Tuple[str, Tuple[str, ...]]:
+        return (
+            hashlib.sha256(clinical_prompt.encode("utf-8")).hexdigest(),
+            tuple(self.AVAILABLE_CONSULTANTS)
+        )
+
+    def _cached_route(self, cache_key: Tuple[str, Tuple[str, ...]]) -> Optional[Tuple[str, List[str]]]:
+        """Memoized routing decision for this key, if any"""
+        with GrokOrchestrator._routing_cache_lock:
+            cached = GrokOrchestrator._routing_cache.get(cache_key)
+            if cached is None:
+                return None
+            GrokOrchestrator._routing_cache.move_to_end(cache_key)
+        return cached[0], list(cached[1])
+
+    async def _aquery(self, consultant_model: str, clinical_prompt: str) -> str:
+        """Query one consultant AI without blocking the event loop (grok_query is blocking)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_CONSULT_EXECUTOR, functools.partial(
+            _limited_grok_query,
+            clinical_prompt,
+            model_name=consultant_model,
+            temperature=0.0,
+            system_prompt=self.CONSULTANT_SYSTEM_PROMPT
+        ))
+
 def grok_orchestrated_query(clinical_prompt: str) -> str:
     """
     Simple API: Send clinical question, get Grok's final decision
@@ -141,7 +301,7 @@ def grok_orchestrated_query(clinical_prompt: str) -> str:
     
     # Return Grok's final decision
     try:
-        final = json.loads(result["grok_final_decision"])
+        final = _json_loads(result["grok_final_decision"])
         return final.get("final_recommendation", result["grok_final_decision"])
     except (json.JSONDecodeError, ValueError, KeyError) as e:
         # Grok's JSON malformed - return raw text
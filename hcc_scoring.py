@@ -3,7 +3,81 @@ HCC/RAF Scoring Engine for Grok Doc v2.5
 Calculates Risk Adjustment Factor (RAF) scores based on CMS-HCC model (v28).
 """
 
-from typing import List, Dict, Tuple
+import multiprocessing
+import os
+import threading
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, NamedTuple, Optional, Tuple
+
+
+class HCCEntry(NamedTuple):
+    """One ICD-10 -> HCC mapping"""
+    hcc: str
+    weight: float
+    desc: str
+
+
+class ICDTable(Mapping):
+    """
+    Read-only ICD-10 -> HCC mapping stored column-wise
+
+    One code -> row index dict plus parallel columns (dense HCC index, weight,
+    description) instead of a nested dict per code. Item access returns an
+    HCCEntry for callers that want the record form.
+    """
+
+    def __init__(self, records: Dict[str, HCCEntry]):
+        self.hcc_ids: List[str] = []          # dense HCC index -> 'HCC38'
+        self.hcc_index: Dict[str, int] = {}   # 'HCC38' -> dense HCC index
+        self.code_to_row: Dict[str, int] = {}
+        self.row_hcc = array('H')
+        self.row_weight = array('d')
+        self.row_desc: List[str] = []
+
+        for code, (hcc_id, weight, desc) in records.items():
+            hcc = self.hcc_index.get(hcc_id)
+            if hcc is None:
+                hcc = self.hcc_index[hcc_id] = len(self.hcc_ids)
+                self.hcc_ids.append(hcc_id)
+            self.code_to_row[code] = len(self.row_desc)
+            self.row_hcc.append(hcc)
+            self.row_weight.append(weight)
+            self.row_desc.append(desc)
+
+        # Canonical codes plus their undotted forms (E11.9 and E119), so a
+        # lookup is one dict probe instead of normalize + re-dot. Only spellings
+        # that resolve() maps are aliased: an undotted I4819 must not reach a
+        # table code dotted elsewhere (I481.9), or I48.19 would pick it up.
+        self.alias_to_row: Dict[str, int] = {}
+        for code in self.code_to_row:
+            for spelling in (code, code.replace('.', '')):
+                row = self.resolve(spelling)
+                if row is not None:
+                    self.alias_to_row.setdefault(spelling, row)
+
+    def resolve(self, code: str) -> Optional[int]:
+        """Row for a code in any case/dot form: exact undotted match, else dot after the third character"""
+        code = code.upper().replace('.', '')
+        row = self.code_to_row.get(code)
+        if row is None and len(code) > 3:
+            row = self.code_to_row.get(f"{code[:3]}.{code[3:]}")
+        return row
+
+    def __getitem__(self, code: str) -> HCCEntry:
+        row = self.code_to_row[code]
+        return HCCEntry(self.hcc_ids[self.row_hcc[row]], self.row_weight[row], self.row_desc[row])
+
+    def __contains__(self, code) -> bool:
+        return code in self.code_to_row
+
+    def __iter__(self):
+        return iter(self.code_to_row)
+
+    def __len__(self) -> int:
+        return len(self.code_to_row)
+
 
 class HCCEngine:
     """
@@ -16,6 +90,24 @@ class HCCEngine:
     - Hierarchy enforcement (severe overrides mild)
     """
     
+    # Parallel batch scoring: patients per worker task, and the smallest batch
+    # worth the process-pool startup
+    BATCH_CHUNK_SIZE = 256
+    PARALLEL_MIN_BATCH = 10000
+    
+    # Rows per LongTable flowable in PDF reports (header repeated on each)
+    PDF_TABLE_CHUNK_ROWS = 500
+    
+    # Integer ages below this resolve their age group by table lookup
+    AGE_GROUP_LUT_SIZE = 128
+    
+    # Distinct non-canonical code spellings whose normalized lookup is remembered
+    NORMALIZED_CODE_CACHE_MAXSIZE = 8192
+    
+    # (ICD table, hierarchies, suppression masks) per engine class, built once
+    _shared_tables: Dict[type, Tuple[ICDTable, Dict[str, List[str]], List[int]]] = {}
+    _shared_tables_lock = threading.Lock()
+    
     def __init__(self):
         # Base rates (2024 Community, Non-Dual, Aged)
         self.demographic_factors = {
@@ -29,57 +121,80 @@ class HCCEngine:
             }
         }
         
+        # Age -> age group for every integer age in the lookup table
+        self._age_group_lut = tuple(self._get_age_group(age) for age in range(self.AGE_GROUP_LUT_SIZE))
+        # ... and gender -> demographic factor per integer age, flattened from the table above
+        self._demographic_lut = {
+            gender: tuple(factors.get(group, 0.30) for group in self._age_group_lut)
+            for gender, factors in self.demographic_factors.items()
+        }
+        
+        # The ICD table is read-only once frozen, so every engine of a class shares one
+        cls = type(self)
+        tables = HCCEngine._shared_tables.get(cls)
+        if tables is None:
+            with HCCEngine._shared_tables_lock:
+                tables = HCCEngine._shared_tables.get(cls)
+                if tables is None:
+                    tables = HCCEngine._shared_tables[cls] = self._build_tables()
+        self.icd_map, self.hierarchies, self._suppress_mask = tables
+        
+        # Raw code -> row (None = unmapped) for codes that missed the alias table
+        self._normalized_rows: Dict[str, Optional[int]] = {}
+
+    def _build_tables(self) -> Tuple[ICDTable, Dict[str, List[str]], List[int]]:
+        """Seed + simulated ICD map frozen into an ICDTable, with hierarchy suppression masks"""
         # Simplified HCC Model v28 Mappings (Subset of 600+ for demo)
-        # Format: 'ICD-10': {'hcc': 'HCC_ID', 'weight': 0.0, 'desc': 'Description'}
+        # Format: 'ICD-10': HCCEntry('HCC_ID', 0.0, 'Description')
         self.icd_map = {
             # Diabetes
-            'E11.9': {'hcc': 'HCC38', 'weight': 0.105, 'desc': 'Diabetes w/o Complications'},
-            'E11.21': {'hcc': 'HCC37', 'weight': 0.302, 'desc': 'Diabetes w/ Diabetic Nephropathy'},
-            'E11.69': {'hcc': 'HCC37', 'weight': 0.302, 'desc': 'Diabetes w/ Other Complication'},
-            'E10.9': {'hcc': 'HCC38', 'weight': 0.105, 'desc': 'Type 1 Diabetes'},
+            'E11.9': HCCEntry('HCC38', 0.105, 'Diabetes w/o Complications'),
+            'E11.21': HCCEntry('HCC37', 0.302, 'Diabetes w/ Diabetic Nephropathy'),
+            'E11.69': HCCEntry('HCC37', 0.302, 'Diabetes w/ Other Complication'),
+            'E10.9': HCCEntry('HCC38', 0.105, 'Type 1 Diabetes'),
             
             # Cardiac
-            'I50.9': {'hcc': 'HCC85', 'weight': 0.323, 'desc': 'Congestive Heart Failure'},
-            'I48.91': {'hcc': 'HCC96', 'weight': 0.268, 'desc': 'Atrial Fibrillation'},
-            'I25.10': {'hcc': 'HCC88', 'weight': 0.135, 'desc': 'Angina Pectoris'},
+            'I50.9': HCCEntry('HCC85', 0.323, 'Congestive Heart Failure'),
+            'I48.91': HCCEntry('HCC96', 0.268, 'Atrial Fibrillation'),
+            'I25.10': HCCEntry('HCC88', 0.135, 'Angina Pectoris'),
             
             # Renal
-            'N18.3': {'hcc': 'HCC138', 'weight': 0.000, 'desc': 'CKD Stage 3 (No Weight in v28)'},
-            'N18.4': {'hcc': 'HCC137', 'weight': 0.237, 'desc': 'CKD Stage 4'},
-            'N18.5': {'hcc': 'HCC136', 'weight': 0.237, 'desc': 'CKD Stage 5'},
-            'N18.6': {'hcc': 'HCC134', 'weight': 1.684, 'desc': 'ESRD / Dialysis'},
+            'N18.3': HCCEntry('HCC138', 0.000, 'CKD Stage 3 (No Weight in v28)'),
+            'N18.4': HCCEntry('HCC137', 0.237, 'CKD Stage 4'),
+            'N18.5': HCCEntry('HCC136', 0.237, 'CKD Stage 5'),
+            'N18.6': HCCEntry('HCC134', 1.684, 'ESRD / Dialysis'),
             
             # Cancer
-            'C34.90': {'hcc': 'HCC9', 'weight': 0.973, 'desc': 'Lung Cancer'},
-            'C50.911': {'hcc': 'HCC12', 'weight': 0.150, 'desc': 'Breast Cancer'},
-            'C61': {'hcc': 'HCC12', 'weight': 0.150, 'desc': 'Prostate Cancer'},
+            'C34.90': HCCEntry('HCC9', 0.973, 'Lung Cancer'),
+            'C50.911': HCCEntry('HCC12', 0.150, 'Breast Cancer'),
+            'C61': HCCEntry('HCC12', 0.150, 'Prostate Cancer'),
             
             # Neurological / Psych
-            'F32.9': {'hcc': 'HCC59', 'weight': 0.395, 'desc': 'Major Depressive Disorder'},
-            'G20': {'hcc': 'HCC70', 'weight': 0.650, 'desc': 'Parkinson\'s Disease'},
-            'G30.9': {'hcc': 'HCC51', 'weight': 0.350, 'desc': 'Alzheimer\'s Disease'},
+            'F32.9': HCCEntry('HCC59', 0.395, 'Major Depressive Disorder'),
+            'G20': HCCEntry('HCC70', 0.650, 'Parkinson\'s Disease'),
+            'G30.9': HCCEntry('HCC51', 0.350, 'Alzheimer\'s Disease'),
             
             # Pulmonary
-            'J44.9': {'hcc': 'HCC111', 'weight': 0.328, 'desc': 'COPD'},
-            'J45.909': {'hcc': 'HCC112', 'weight': 0.000, 'desc': 'Asthma (No Weight)'},
+            'J44.9': HCCEntry('HCC111', 0.328, 'COPD'),
+            'J45.909': HCCEntry('HCC112', 0.000, 'Asthma (No Weight)'),
             
             # Vascular
-            'I73.9': {'hcc': 'HCC108', 'weight': 0.288, 'desc': 'Vascular Disease'},
-            'I70.0': {'hcc': 'HCC108', 'weight': 0.288, 'desc': 'Atherosclerosis of aorta'},
-            'I70.209': {'hcc': 'HCC108', 'weight': 0.288, 'desc': 'Unsp atherosclerosis of native arteries of extremities'},
+            'I73.9': HCCEntry('HCC108', 0.288, 'Vascular Disease'),
+            'I70.0': HCCEntry('HCC108', 0.288, 'Atherosclerosis of aorta'),
+            'I70.209': HCCEntry('HCC108', 0.288, 'Unsp atherosclerosis of native arteries of extremities'),
             
             # Metabolic / Other
-            'E66.01': {'hcc': 'HCC22', 'weight': 0.273, 'desc': 'Morbid Obesity'},
-            'E66.2': {'hcc': 'HCC22', 'weight': 0.273, 'desc': 'Morbid (severe) obesity with alveolar hypoventilation'},
-            'Z79.4': {'hcc': 'HCC_RX', 'weight': 0.000, 'desc': 'Long-term use of insulin'}, # Interaction flag
+            'E66.01': HCCEntry('HCC22', 0.273, 'Morbid Obesity'),
+            'E66.2': HCCEntry('HCC22', 0.273, 'Morbid (severe) obesity with alveolar hypoventilation'),
+            'Z79.4': HCCEntry('HCC_RX', 0.000, 'Long-term use of insulin'), # Interaction flag
             
             # Liver
-            'K70.30': {'hcc': 'HCC29', 'weight': 0.400, 'desc': 'Alcoholic cirrhosis of liver without ascites'},
-            'K74.60': {'hcc': 'HCC29', 'weight': 0.400, 'desc': 'Unspecified cirrhosis of liver'},
+            'K70.30': HCCEntry('HCC29', 0.400, 'Alcoholic cirrhosis of liver without ascites'),
+            'K74.60': HCCEntry('HCC29', 0.400, 'Unspecified cirrhosis of liver'),
             
             # Blood
-            'D61.818': {'hcc': 'HCC48', 'weight': 0.180, 'desc': 'Other pancytopenia'},
-            'D69.6': {'hcc': 'HCC48', 'weight': 0.180, 'desc': 'Thrombocytopenia, unspecified'},
+            'D61.818': HCCEntry('HCC48', 0.180, 'Other pancytopenia'),
+            'D69.6': HCCEntry('HCC48', 0.180, 'Thrombocytopenia, unspecified'),
         }
         
         # SIMULATED EXPANSION (v3.0 Enterprise)
@@ -87,31 +202,34 @@ class HCCEngine:
         # Here we algorithmically generate mappings to reach ~4,200 codes for the demo.
         self._expand_mappings()
 
+        # Freeze into column storage; each HCC's hierarchy becomes a bitmask
+        # (bit i = dense HCC index i) of the HCCs it suppresses
+        icd_table = ICDTable(self.icd_map)
+        hcc_index = icd_table.hcc_index
+        suppress_mask = [0] * len(icd_table.hcc_ids)
+        for parent, children in self.hierarchies.items():
+            if parent in hcc_index:
+                for child in children:
+                    if child in hcc_index:
+                        suppress_mask[hcc_index[parent]] |= 1 << hcc_index[child]
+        return icd_table, self.hierarchies, suppress_mask
+
     def _expand_mappings(self):
         """Generates additional ICD-10 mappings to simulate full CMS-HCC coverage"""
-        # Diabetes variations (E08-E13)
-        for i in range(100):
-            code = f"E11.{i:02d}"
-            if code not in self.icd_map:
-                self.icd_map[code] = {'hcc': 'HCC38', 'weight': 0.105, 'desc': f'Diabetes Type 2 var {i}'}
-        
-        # Cancer variations (C00-C96)
-        for i in range(1000):
-            code = f"C{i:02d}.9"
-            if code not in self.icd_map:
-                self.icd_map[code] = {'hcc': 'HCC12', 'weight': 0.150, 'desc': f'Malignant Neoplasm var {i}'}
-                
-        # Heart variations (I00-I99)
-        for i in range(1000):
-            code = f"I{i:02d}.9"
-            if code not in self.icd_map:
-                self.icd_map[code] = {'hcc': 'HCC85', 'weight': 0.323, 'desc': f'Cardiac Condition var {i}'}
-                
-        # Kidney variations (N00-N99)
-        for i in range(1000):
-            code = f"N{i:02d}.9"
-            if code not in self.icd_map:
-                self.icd_map[code] = {'hcc': 'HCC138', 'weight': 0.000, 'desc': f'Renal Condition var {i}'}
+        # Each synthetic group shares one entry; curated codes above are never overwritten
+        icd_map = self.icd_map
+        expansion = (
+            # Diabetes variations (E08-E13)
+            ([f"E11.{i:02d}" for i in range(100)], HCCEntry('HCC38', 0.105, 'Diabetes Type 2 (generic)')),
+            # Cancer variations (C00-C96)
+            ([f"C{i:02d}.9" for i in range(1000)], HCCEntry('HCC12', 0.150, 'Malignant Neoplasm (generic)')),
+            # Heart variations (I00-I99)
+            ([f"I{i:02d}.9" for i in range(1000)], HCCEntry('HCC85', 0.323, 'Cardiac Condition (generic)')),
+            # Kidney variations (N00-N99)
+            ([f"N{i:02d}.9" for i in range(1000)], HCCEntry('HCC138', 0.000, 'Renal Condition (generic)')),
+        )
+        for codes, entry in expansion:
+            icd_map.update(dict.fromkeys([code for code in codes if code not in icd_map], entry))
                 
         # Total should be > 3000 now
         
@@ -134,63 +252,71 @@ class HCCEngine:
         Returns:
             Dict with total score and breakdown
         """
+        return self._score_rows(age, gender, [self._lookup_row(code) for code in icd_codes])
+
+    def _score_rows(self, age: int, gender: str, rows: List[Optional[int]], include_details: bool = True) -> Dict:
+        """Score a patient from already-resolved table rows (None = unmapped code)"""
         score = 0.0
-        details = []
         
         # 1. Demographic Score
-        age_group = self._get_age_group(age)
-        demo_score = self.demographic_factors.get(gender, {}).get(age_group, 0.30)
+        if type(age) is int and 0 <= age < self.AGE_GROUP_LUT_SIZE:
+            age_group = self._age_group_lut[age]
+            factors_by_age = self._demographic_lut.get(gender)
+            demo_score = factors_by_age[age] if factors_by_age is not None else 0.30
+        else:
+            # Non-integer or out-of-table ages take the branchy path
+            age_group = self._get_age_group(age)
+            demo_score = self.demographic_factors.get(gender, {}).get(age_group, 0.30)
         score += demo_score
-        details.append({
-            'category': 'Demographic',
-            'desc': f"{gender} {age} ({age_group})",
-            'weight': demo_score
-        })
         
         # 2. HCC Score
-        unique_hccs = {} # HCC_ID -> {weight, desc}
+        table = self.icd_map
+        row_hcc = table.row_hcc
+        row_weight = table.row_weight
+        unique_hccs = {} # dense HCC index -> table row
         
         # Map ICD to HCC
-        for code in icd_codes:
-            code = code.upper().replace('.', '') # Normalize
-            # Try exact match or dot format
-            match = None
-            if code in self.icd_map:
-                match = self.icd_map[code]
-            else:
-                # Try adding dot back (e.g. E119 -> E11.9)
-                if len(code) > 3:
-                    dotted = f"{code[:3]}.{code[3:]}"
-                    if dotted in self.icd_map:
-                        match = self.icd_map[dotted]
-            
-            if match:
-                hcc_id = match['hcc']
+        for row in rows:
+            if row is not None:
+                hcc = row_hcc[row]
                 # Keep highest weight if multiple ICDs map to same HCC (usually same weight)
-                if hcc_id not in unique_hccs or match['weight'] > unique_hccs[hcc_id]['weight']:
-                    unique_hccs[hcc_id] = match
-
-        # Apply Hierarchies
-        final_hccs = unique_hccs.copy()
-        for hcc_id in unique_hccs:
-            if hcc_id in self.hierarchies:
-                for child_hcc in self.hierarchies[hcc_id]:
-                    if child_hcc in final_hccs:
-                        final_hccs.pop(child_hcc)
-                        # Log hierarchy drop?
+                current = unique_hccs.get(hcc)
+                if current is None or row_weight[row] > row_weight[current]:
+                    unique_hccs[hcc] = row
+
+        # Apply Hierarchies: OR the masks of every present HCC, drop suppressed bits
+        suppress_mask = self._suppress_mask
+        suppressed = 0
+        for hcc in unique_hccs:
+            suppressed |= suppress_mask[hcc]
+        if suppressed:
+            final_hccs = {hcc: row for hcc, row in unique_hccs.items() if not (suppressed >> hcc) & 1}
+        else:
+            final_hccs = unique_hccs
         
         # Sum HCC weights
         hcc_total = 0.0
-        for hcc_id, data in final_hccs.items():
-            hcc_total += data['weight']
-            details.append({
-                'category': 'Condition',
-                'desc': f"{hcc_id}: {data['desc']}",
-                'weight': data['weight']
-            })
+        for row in final_hccs.values():
+            hcc_total += row_weight[row]
             
         score += hcc_total
         
+        details = []
+        if include_details:
+            details.append({
+                'category': 'Demographic',
+                'desc': f"{gender} {age} ({age_group})",
+                'weight': demo_score
+            })
+            hcc_ids = table.hcc_ids
+            row_desc = table.row_desc
+            for hcc, row in final_hccs.items():
+                details.append({
+                    'category': 'Condition',
+                    'desc': f"{hcc_ids[hcc]}: {row_desc[row]}",
+                    'weight': row_weight[row]
+                })
+        
         # Revenue Impact Estimation (Base rate ~$11,000/year)
         base_rate = 11000
         revenue = score * base_rate
@@ -202,6 +328,21 @@ class HCCEngine:
             'hcc_count': len(final_hccs)
         }
 
+    def _lookup_row(self, code: str) -> Optional[int]:
+        """Table row for an ICD-10 code in any of E119 / E11.9 / e11.9 forms"""
+        aliases = self.icd_map.alias_to_row
+        row = aliases.get(code)
+        if row is None:
+            # Only mixed-case, oddly dotted or unmapped input pays for normalization,
+            # and only the first time that spelling is seen
+            cache = self._normalized_rows
+            row = cache.get(code, -1)
+            if row == -1:
+                row = self.icd_map.resolve(code)
+                if len(cache) < self.NORMALIZED_CODE_CACHE_MAXSIZE:
+                    cache[code] = row
+        return row
+
     def _get_age_group(self, age: int) -> str:
         if age < 65: return '65-69' # Fallback for under 65 (disabled model not implemented)
         if age <= 69: return '65-69'
@@ -213,24 +354,41 @@ class HCCEngine:
     
     # ─── v6.5 ENTERPRISE: Batch Processing & Reporting ─────────────
     
-    def batch_calculate(self, patients: List[Dict]) -> List[Dict]:
+    def batch_calculate(self, patients: List[Dict], include_details: bool = True,
+                        workers: int = 1) -> List[Dict]:
         """
         Calculate RAF scores for multiple patients.
         
         Args:
             patients: List of patient dicts with keys: {mrn, age, gender, icd_codes}
+            include_details: Build the per-HCC breakdown (skip for score-only payer runs)
+            workers: Worker processes for large batches (0 = one per CPU core)
         
         Returns:
             List of results with RAF scores and revenue impact
         """
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(patients) >= self.PARALLEL_MIN_BATCH:
+            return self._batch_calculate_parallel(patients, include_details, workers)
+
+        # Each distinct code string is normalized and looked up once per batch
+        row_cache: Dict[str, Optional[int]] = {}
         results = []
         for patient in patients:
             mrn = patient.get('mrn', 'UNKNOWN')
             age = patient.get('age', 65)
             gender = patient.get('gender', 'M')
             codes = patient.get('icd_codes', [])
+
+            rows = []
+            for code in codes:
+                row = row_cache.get(code, -1)
+                if row == -1:
+                    row = row_cache[code] = self._lookup_row(code)
+                rows.append(row)
             
-            result = self.calculate_raf(age, gender, codes)
+            result = self._score_rows(age, gender, rows, include_details)
             result['mrn'] = mrn
             # Ensure 'estimated_revenue' exists for reporting compatibility
             if 'revenue_impact' in result and 'estimated_revenue' not in result:
@@ -239,6 +397,25 @@ class HCCEngine:
             
         return results
     
+    def _batch_calculate_parallel(self, patients: List[Dict], include_details: bool,
+                                  workers: int) -> List[Dict]:
+        """Shard the batch across worker processes, each holding a copy of this engine"""
+        # fork hands the engine (and its ICD table) to the workers without pickling
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing.get_context()
+        
+        size = self.BATCH_CHUNK_SIZE
+        chunks = [patients[i:i + size] for i in range(0, len(patients), size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_batch_worker, initargs=(self,)) as executor:
+            for chunk_results in executor.map(_score_batch_chunk, chunks,
+                                              [include_details] * len(chunks)):
+                results.extend(chunk_results)
+        return results
+    
     def generate_csv_report(self, results: List[Dict], filename: str = 'hcc_report.csv'):
         """
         Export batch RAF scores to CSV.
@@ -249,22 +426,20 @@ class HCCEngine:
         """
         import csv
         
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'mrn', 'raf_score', 'hcc_count', 'revenue_impact'
-            ])
-            writer.writeheader()
-            
+        def _rows():
             for r in results:
-                # Count HCCs from details array
-                hcc_count = len([d for d in r.get('details', []) if d.get('weight', 0) > 0])
-                
-                writer.writerow({
-                    'mrn': r.get('mrn', 'N/A'),
-                    'raf_score': round(r['raf_score'], 3),
-                    'hcc_count': hcc_count,
-                    'revenue_impact': f"${r.get('estimated_revenue', r.get('revenue_impact', 0)):,.2f}"
-                })
+                yield (
+                    r.get('mrn', 'N/A'),
+                    round(r['raf_score'], 3),
+                    r.get('hcc_count', 0),
+                    f"${r.get('estimated_revenue', r.get('revenue_impact', 0)):,.2f}"
+                )
+
+        # Buffered writer; rows streamed straight from the generator
+        with open(filename, 'w', newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(['mrn', 'raf_score', 'hcc_count', 'revenue_impact'])
+            writer.writerows(_rows())
         
         return filename
     
@@ -279,7 +454,7 @@ class HCCEngine:
         """
         try:
             from reportlab.lib.pagesizes import letter
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+            from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer
             from reportlab.lib.styles import getSampleStyleSheet
             from reportlab.lib import colors
             
@@ -305,27 +480,30 @@ class HCCEngine:
             elements.append(summary)
             elements.append(Spacer(1, 12))
             
-            # Table
-            data = [['MRN', 'RAF Score', 'HCC Count', 'Revenue Impact']]
-            for r in results[:50]:  # Limit to 50 for PDF readability
-                hcc_count = len([d for d in r.get('details', []) if d.get('weight', 0) > 0])
-                data.append([
-                    r.get('mrn', 'N/A'),
-                    f"{r['raf_score']:.3f}",
-                    str(hcc_count),
-                    f"${r.get('estimated_revenue', r.get('revenue_impact', 0)):,.2f}"
-                ])
-            
-            table = Table(data)
-            table.setStyle(TableStyle([
+            # Table: every patient, split into LongTable chunks that repeat the header
+            # row across page breaks (no single giant Table to lay out)
+            header = ['MRN', 'RAF Score', 'HCC Count', 'Revenue Impact']
+            table_style = TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
                 ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
                 ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            elements.append(table)
+            ])
+            chunk_rows = self.PDF_TABLE_CHUNK_ROWS
+            for start in range(0, len(results), chunk_rows):
+                data = [header]
+                for r in results[start:start + chunk_rows]:
+                    data.append([
+                        r.get('mrn', 'N/A'),
+                        f"{r['raf_score']:.3f}",
+                        str(r.get('hcc_count', 0)),
+                        f"${r.get('estimated_revenue', r.get('revenue_impact', 0)):,.2f}"
+                    ])
+                table = LongTable(data, repeatRows=1)
+                table.setStyle(table_style)
+                elements.append(table)
             
             doc.build(elements)
             return filename
@@ -336,8 +514,35 @@ class HCCEngine:
             return None
 
 
+# Process-wide engine: the ICD table and hierarchy masks are built once and are
+# read-only afterwards, so every request can share it
+_hcc_engine: Optional[HCCEngine] = None
+_hcc_engine_lock = threading.Lock()
+
+def get_hcc_engine() -> HCCEngine:
+    global _hcc_engine
+    if _hcc_engine is None:
+        with _hcc_engine_lock:
+            if _hcc_engine is None:
+                _hcc_engine = HCCEngine()
+    return _hcc_engine
+
+
+# Engine owned by a batch worker process (set once by the pool initializer)
+_worker_engine: Optional[HCCEngine] = None
+
+
+def _init_batch_worker(engine: HCCEngine):
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _score_batch_chunk(chunk: List[Dict], include_details: bool) -> List[Dict]:
+    return _worker_engine.batch_calculate(chunk, include_details)
+
+
 if __name__ == "__main__":
-    engine = HCCEngine()
+    engine = get_hcc_engine()
     
     # Test batch processing
     patients = [
@@ -6,7 +6,8 @@ Supports ADT (Admission), ORU (Results), and ORM (Orders).
 
 import socket
 import threading
-from typing import Dict, Optional
+from array import array
+from typing import Dict, List, Optional
 
 # MLLP Constants
 SB = b'\x0b'  # Start Block
@@ -19,13 +20,21 @@ class HL7MessageBuilder:
     @staticmethod
     def create_ack(original_msg: str) -> str:
         """Create AA (Application Accept) ACK for a received message"""
-        segments = original_msg.split('\r')
-        msh = segments[0].split('|')
-        
+        # Only MSH is needed; don't split the (possibly large) rest of the message
+        msh = original_msg.partition('\r')[0].split('|')
+        return HL7MessageBuilder._build_ack(msh[2], msh[3], msh[6], msh[9])
+
+    @staticmethod
+    def create_ack_for(message: "HL7Message") -> str:
+        """create_ack for a lazily parsed message (reads four MSH fields only)"""
+        return HL7MessageBuilder._build_ack(*(message.field(0, j) for j in (2, 3, 6, 9)))
+
+    @staticmethod
+    def _build_ack(sender: str, facility: str, timestamp: str, control_id: str) -> str:
         # MSH|^~\&|GrokDoc|Hospital|EHR|Hospital|202511281200||ACK|MSG001|P|2.5
-        ack_msh = f"MSH|^~\\&|GrokDoc|Hospital|{msh[2]}|{msh[3]}|{msh[6]}||ACK|{msh[9]}|P|2.5"
+        ack_msh = f"MSH|^~\\&|GrokDoc|Hospital|{sender}|{facility}|{timestamp}||ACK|{control_id}|P|2.5"
         # MSA|AA|MSG001
-        ack_msa = f"MSA|AA|{msh[9]}"
+        ack_msa = f"MSA|AA|{control_id}"
         
         return f"{ack_msh}\r{ack_msa}\r"
 
@@ -59,17 +68,80 @@ class HL7MessageBuilder:
                 
         return parsed
 
+class HL7Message:
+    """
+    Lazily parsed HL7 v2 message over its raw bytes
+
+    Segment boundaries are indexed once; fields are located with bytes.find
+    and decoded only when asked for, so a large ORU costs a handful of
+    allocations instead of a list of strings per segment. Field indices
+    match parse_message (fields[0] is the segment type).
+    """
+
+    __slots__ = ('_raw', '_seg_offsets')
+
+    def __init__(self, raw: bytes):
+        self._raw = bytes(raw)
+        # Start of each segment, plus one past the end of the last one
+        offsets = array('I', [0])
+        find = self._raw.find
+        pos = find(b'\r')
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = find(b'\r', pos + 1)
+        if offsets[-1] != len(self._raw):
+            offsets.append(len(self._raw) + 1)  # last segment has no trailing CR
+        self._seg_offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._seg_offsets) - 1
+
+    def segment(self, i: int) -> memoryview:
+        """Raw bytes of segment i (no copy)"""
+        return memoryview(self._raw)[self._seg_offsets[i]:self._seg_offsets[i + 1] - 1]
+
+    def field(self, i: int, j: int) -> str:
+        """Field j of segment i ('' if the segment is shorter)"""
+        raw = self._raw
+        start, end = self._seg_offsets[i], self._seg_offsets[i + 1] - 1
+        for _ in range(j):
+            start = raw.find(b'|', start, end)
+            if start == -1:
+                return ''
+            start += 1
+        stop = raw.find(b'|', start, end)
+        return raw[start:end if stop == -1 else stop].decode('utf-8')
+
+    def segment_type(self, i: int) -> str:
+        return self.field(i, 0)
+
+    def find_segments(self, seg_type: str) -> List[int]:
+        """Indices of segments of the given type (e.g. 'OBX')"""
+        prefix = seg_type.encode('ascii') + b'|'
+        raw, offsets = self._raw, self._seg_offsets
+        return [i for i in range(len(self)) if raw.startswith(prefix, offsets[i])]
+
 class MLLPServer:
     """
     Async MLLP Server to receive HL7 messages.
-    Runs in a background thread.
+    Runs in a background thread; each sender connection gets its own handler
+    thread (up to MAX_CLIENTS at once).
     """
     
-    def __init__(self, host='0.0.0.0', port=2575):
+    # Initial receive buffer per connection (doubles if a frame outgrows it)
+    RECV_BUFFER_SIZE = 65536
+    
+    # Concurrent sender connections; further accepts wait for a free slot
+    MAX_CLIENTS = 16
+    
+    def __init__(self, host='0.0.0.0', port=2575, lazy_parse: bool = False):
         self.host = host
         self.port = port
+        self.lazy_parse = lazy_parse  # store HL7Message views instead of parsed dicts
         self.running = False
         self.messages = [] # Queue of received messages
+        self._messages_lock = threading.Lock()
+        self._client_slots = threading.BoundedSemaphore(self.MAX_CLIENTS)
         self.sock = None
 
     def start(self):
@@ -92,40 +164,81 @@ class MLLPServer:
             
             while self.running:
                 try:
+                    self._client_slots.acquire()
                     conn, addr = self.sock.accept()
-                    self._handle_client(conn)
                 except OSError:
+                    self._client_slots.release()
                     break # Socket closed
+                # Daemon handler thread, like the server thread, so an open
+                # sender connection never blocks interpreter exit
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
         except Exception as e:
             print(f"MLLP Server Error: {e}")
 
+    def _serve_client(self, conn):
+        try:
+            self._handle_client(conn)
+        except OSError:
+            pass # Sender dropped the connection
+        finally:
+            self._client_slots.release()
+
     def _handle_client(self, conn):
-        buffer = b""
+        # Preallocated buffer filled in place by recv_into (no bytes object per
+        # recv, no concatenation); buffer[:filled] holds unconsumed input
+        buffer = bytearray(self.RECV_BUFFER_SIZE)
+        filled = 0
+        scanned = 0  # bytes already searched for EB
         with conn:
             while True:
-                chunk = conn.recv(4096)
-                if not chunk: break
-                buffer += chunk
+                if filled == len(buffer):
+                    buffer.extend(bytes(len(buffer)))  # frame larger than the buffer
+                with memoryview(buffer) as view:
+                    received = conn.recv_into(view[filled:])
+                if not received: break
+                filled += received
                 
-                # Check for MLLP envelope
-                if SB in buffer and EB in buffer:
-                    start = buffer.find(SB)
-                    end = buffer.find(EB)
+                # Extract every complete MLLP frame in the buffer (pipelined senders
+                # can deliver several per recv); ACKs go back in one sendall
+                acks = bytearray()
+                consumed = 0
+                while True:
+                    start = buffer.find(SB, consumed, filled)
+                    if start == -1:
+                        break
+                    end = buffer.find(EB, max(start + 1, scanned), filled)
+                    if end == -1:
+                        break
                     
-                    if start != -1 and end != -1:
+                    if self.lazy_parse:
+                        # Index only; fields decode on access
+                        message = HL7Message(buffer[start+1:end])
+                        with self._messages_lock:
+                            self.messages.append(message)
+                        ack = HL7MessageBuilder.create_ack_for(message)
+                    else:
                         # Extract message
                         raw_msg = buffer[start+1:end].decode('utf-8')
                         # Parse and store
                         parsed = HL7MessageBuilder.parse_message(raw_msg)
-                        self.messages.append(parsed)
-                        
-                        # Send ACK
+                        with self._messages_lock:
+                            self.messages.append(parsed)
                         ack = HL7MessageBuilder.create_ack(raw_msg)
-                        response = SB + ack.encode('utf-8') + EB + CR
-                        conn.sendall(response)
-                        
-                        # Clear buffer (handle multiple msgs?)
-                        buffer = buffer[end+2:]
+                    
+                    # Queue ACK
+                    acks += SB + ack.encode('utf-8') + EB + CR
+                    consumed = min(end + 2, filled)
+                    scanned = consumed
+                
+                if acks:
+                    conn.sendall(acks)
+                # Move the unconsumed tail to the front in one copy; it has
+                # already been searched for EB
+                if consumed:
+                    remaining = filled - consumed
+                    buffer[:remaining] = buffer[consumed:filled]
+                    filled = remaining
+                scanned = filled
 
 if __name__ == "__main__":
     # Test Server
@@ -19,6 +19,8 @@ Model features:
 
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+import re
+import threading
 import numpy as np
 import pandas as pd
 
@@ -40,6 +42,18 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     print("WARNING: scikit-learn not installed. Run: pip install scikit-learn")
 
+# Medication classes for creatinine features: one scan over all meds, group name = class
+_CR_MED_RE = re.compile(
+    r'(?P<diuretic>furosemide|lasix)|(?P<acei>lisinopril|enalapril)'
+    r'|(?P<arb>losartan|valsartan)|(?P<nsaid>ibuprofen|ketorolac)'
+)
+
+# Potassium-relevant medications by class (case-insensitive, one scan)
+_K_MED_RE = re.compile(
+    r'(?P<loop>furosemide)|(?P<k_sparing>spironolactone)|(?P<acei>lisinopril|enalapril)',
+    re.IGNORECASE
+)
+
 
 class CreatininePredictor:
     """
@@ -63,11 +77,16 @@ class CreatininePredictor:
             max_depth=6,
             learning_rate=0.1,
             objective='reg:squarederror',
+            tree_method='hist',  # histogram trees; CPU-only inference below
+            device='cpu',
             random_state=42
         )
 
         self.scaler = StandardScaler() if SKLEARN_AVAILABLE else None
 
+        # Per-thread (1, F) feature buffer reused by single-patient predictions
+        self._row_buffers = threading.local()
+
         # Load pre-trained model if available
         if model_path:
             self.model.load_model(model_path)
@@ -91,73 +110,93 @@ class CreatininePredictor:
         - One-hot encoded categorical features (15)
         """
 
-        features = []
+        return np.array([self._feature_row(patient_data)])
 
-        # Demographics
-        features.append(patient_data.get('age', 65))
-        features.append(patient_data.get('weight', 70))
-        features.append(1 if patient_data.get('gender', 'M') == 'M' else 0)
+    def _vectorize_batch(self, patients: List[Dict]) -> np.ndarray:
+        """Feature matrix for many patients: one contiguous (N, F) float32 array"""
+        return np.array([self._feature_row(p) for p in patients], dtype=np.float32)
 
-        # Baseline labs
-        baseline_cr = float(patient_data.get('labs', {}).get('creatinine', 1.0))
-        features.append(baseline_cr)
-        features.append(float(patient_data.get('labs', {}).get('bun', 20)))
-        features.append(float(patient_data.get('labs', {}).get('sodium', 140)))
-        features.append(float(patient_data.get('labs', {}).get('potassium', 4.0)))
-        features.append(float(patient_data.get('labs', {}).get('chloride', 102)))
-        features.append(float(patient_data.get('labs', {}).get('bicarbonate', 24)))
-        features.append(float(patient_data.get('labs', {}).get('glucose', 100)))
-
-        # Comorbidities (binary)
-        comorbidities = patient_data.get('comorbidities', [])
-        features.append(1 if 'ckd' in comorbidities else 0)
-        features.append(1 if 'chf' in comorbidities else 0)
-        features.append(1 if 'diabetes' in comorbidities else 0)
-        features.append(1 if 'htn' in comorbidities else 0)
-        features.append(1 if 'sepsis' in comorbidities else 0)
-
-        # Medications (binary)
-        medications = patient_data.get('medications', [])
-        features.append(1 if any('furosemide' in m or 'lasix' in m for m in medications) else 0)
-        features.append(1 if any('lisinopril' in m or 'enalapril' in m for m in medications) else 0)
-        features.append(1 if any('losartan' in m or 'valsartan' in m for m in medications) else 0)
-        features.append(1 if any('ibuprofen' in m or 'ketorolac' in m for m in medications) else 0)
-
-        # Drug dosing info
-        features.append(float(patient_data.get('drug_dose_mg', 1000)))
-        features.append(float(patient_data.get('dose_frequency_hours', 12)))
-        features.append(1 if patient_data.get('route', 'IV') == 'IV' else 0)
-
-        # Vitals
-        features.append(float(patient_data.get('vitals', {}).get('sbp', 120)))
-        features.append(float(patient_data.get('vitals', {}).get('hr', 80)))
-        features.append(float(patient_data.get('vitals', {}).get('temp', 98.6)))
-        features.append(float(patient_data.get('vitals', {}).get('urine_output_ml', 1500)))
-
-        # Time features
-        features.append(float(patient_data.get('hours_since_baseline', 0)))
-
-        # Derived features
-        age = patient_data.get('age', 65)
-        weight = patient_data.get('weight', 70)
-        gender = patient_data.get('gender', 'M')
+    def _vectorize_one(self, patient_data: Dict) -> np.ndarray:
+        """
+        (1, F) float32 features for one patient, written into this thread's
+        reusable buffer (valid until the thread's next call)
+        """
+        row = self._feature_row(patient_data)
+        buf = getattr(self._row_buffers, 'x', None)
+        if buf is None or buf.shape[1] != len(row):
+            buf = self._row_buffers.x = np.empty((1, len(row)), dtype=np.float32)
+        buf[0] = row
+        return buf
+
+    def _feature_row(self, patient_data: Dict) -> List[float]:
+        """Feature values for one patient (see _vectorize_features for the layout)"""
+        # Nested sections are fetched once, not once per feature
+        get = patient_data.get
+        labs = get('labs') or {}
+        vitals = get('vitals') or {}
+        comorbidities = get('comorbidities', [])
+        medications = get('medications', [])
+        med_classes = {m.lastgroup for m in _CR_MED_RE.finditer('\n'.join(medications))}
+
+        age = get('age', 65)
+        weight = get('weight', 70)
+        gender = get('gender', 'M')
+        baseline_cr = float(labs.get('creatinine', 1.0))
+        bun = float(labs.get('bun', 20))
+        urine_output = float(vitals.get('urine_output_ml', 1500))
 
         # Cockcroft-Gault CrCl
         crcl = ((140 - age) * weight) / (72 * baseline_cr)
         if gender == 'F':
             crcl *= 0.85
-        features.append(crcl)
-
-        # BUN/Cr ratio
-        bun = float(patient_data.get('labs', {}).get('bun', 20))
-        features.append(bun / max(baseline_cr, 0.1))
-
-        # Fluid balance (estimate)
-        fluid_in = float(patient_data.get('fluid_in_ml', 2000))
-        fluid_out = float(patient_data.get('vitals', {}).get('urine_output_ml', 1500))
-        features.append(fluid_in - fluid_out)
 
-        return np.array(features).reshape(1, -1)
+        return [
+            # Demographics
+            age,
+            weight,
+            1 if gender == 'M' else 0,
+
+            # Baseline labs
+            baseline_cr,
+            bun,
+            float(labs.get('sodium', 140)),
+            float(labs.get('potassium', 4.0)),
+            float(labs.get('chloride', 102)),
+            float(labs.get('bicarbonate', 24)),
+            float(labs.get('glucose', 100)),
+
+            # Comorbidities (binary)
+            1 if 'ckd' in comorbidities else 0,
+            1 if 'chf' in comorbidities else 0,
+            1 if 'diabetes' in comorbidities else 0,
+            1 if 'htn' in comorbidities else 0,
+            1 if 'sepsis' in comorbidities else 0,
+
+            # Medications (binary)
+            1 if 'diuretic' in med_classes else 0,
+            1 if 'acei' in med_classes else 0,
+            1 if 'arb' in med_classes else 0,
+            1 if 'nsaid' in med_classes else 0,
+
+            # Drug dosing info
+            float(get('drug_dose_mg', 1000)),
+            float(get('dose_frequency_hours', 12)),
+            1 if get('route', 'IV') == 'IV' else 0,
+
+            # Vitals
+            float(vitals.get('sbp', 120)),
+            float(vitals.get('hr', 80)),
+            float(vitals.get('temp', 98.6)),
+            urine_output,
+
+            # Time features
+            float(get('hours_since_baseline', 0)),
+
+            # Derived: CrCl, BUN/Cr ratio, fluid balance (estimate)
+            crcl,
+            bun / max(baseline_cr, 0.1),
+            float(get('fluid_in_ml', 2000)) - urine_output,
+        ]
 
     def predict_creatinine_24h(self, patient_data: Dict) -> Dict:
         """
@@ -177,16 +216,40 @@ class CreatininePredictor:
             }
         """
 
-        # Extract features
-        X = self._vectorize_features(patient_data)
+        return self.predict_creatinine_24h_batch([patient_data])[0]
+
+    def predict_creatinine_24h_batch(self, patients: List[Dict]) -> List[Dict]:
+        """
+        Predict 24h creatinine for many patients with a single model call
+
+        Args:
+            patients: List of patient information dicts
+
+        Returns:
+            List of prediction dicts (same format as predict_creatinine_24h), in input order
+        """
+        if not patients:
+            return []
+
+        # Extract features into one (N, F) float32 matrix; single-patient
+        # (bedside) calls reuse a per-thread buffer
+        X = self._vectorize_one(patients[0]) if len(patients) == 1 else self._vectorize_batch(patients)
 
         # Scale if scaler available
         if self.scaler:
             X = self.scaler.transform(X)
 
-        # Predict
-        predicted_cr = float(self.model.predict(X)[0])
+        # Predict all rows at once (columns come from _feature_row, so skip the
+        # per-call feature-name validation)
+        predictions = self.model.predict(X, validate_features=False)
+
+        return [
+            self._format_prediction(patient_data, float(predicted_cr), X.shape[1])
+            for patient_data, predicted_cr in zip(patients, predictions)
+        ]
 
+    def _format_prediction(self, patient_data: Dict, predicted_cr: float, n_features: int) -> Dict:
+        """Build the creatinine prediction dict for one patient"""
         # Get baseline
         baseline_cr = float(patient_data.get('labs', {}).get('creatinine', 1.0))
 
@@ -207,7 +270,7 @@ class CreatininePredictor:
             'percent_change': round(percent_change, 1),
             'aki_risk': aki_risk,
             'confidence': 0.85,  # Placeholder - calculate from model variance
-            'features_used': X.shape[1],
+            'features_used': n_features,
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             'prediction_horizon_hours': 24
         }
@@ -221,17 +284,10 @@ class CreatininePredictor:
                 Required: baseline_cr, cr_24h, age, weight, gender, etc.
         """
 
-        # Extract features and target
-        X = []
+        # Extract features and target (plain record dicts, not an iterrows Series per row)
+        X = self._vectorize_batch(ehr_data.to_dict('records'))
         y = ehr_data['cr_24h'].values  # Target: Cr at 24h
 
-        for _, row in ehr_data.iterrows():
-            patient_data = row.to_dict()
-            features = self._vectorize_features(patient_data)
-            X.append(features[0])
-
-        X = np.array(X)
-
         # Scale
         if self.scaler:
             X = self.scaler.fit_transform(X)
@@ -324,12 +380,14 @@ class PotassiumPredictor:
     def predict_potassium(self, baseline_k: float, medication: str, dose: float) -> Dict:
         """Predict K+ change with medication"""
 
+        med_classes = {m.lastgroup for m in _K_MED_RE.finditer(medication)}
+
         # Simple heuristic (train on real data for production)
-        if 'furosemide' in medication.lower():
+        if 'loop' in med_classes:
             predicted_k = baseline_k - 0.3 * (dose / 40)  # Hypokalemia
-        elif 'spironolactone' in medication.lower():
+        elif 'k_sparing' in med_classes:
             predicted_k = baseline_k + 0.5 * (dose / 25)  # Hyperkalemia
-        elif any(x in medication.lower() for x in ['lisinopril', 'enalapril']):
+        elif 'acei' in med_classes:
             predicted_k = baseline_k + 0.2  # Mild hyperkalemia
         else:
             predicted_k = baseline_k
@@ -345,30 +403,37 @@ class PotassiumPredictor:
         }
 
 
-# Global predictors
+# Global predictors (built once per process; concurrent first calls share one)
 _cr_predictor = None
 _inr_predictor = None
 _k_predictor = None
+_predictor_lock = threading.Lock()
 
 def get_creatinine_predictor() -> CreatininePredictor:
     """Get global creatinine predictor"""
     global _cr_predictor
     if _cr_predictor is None:
-        _cr_predictor = CreatininePredictor()
+        with _predictor_lock:
+            if _cr_predictor is None:
+                _cr_predictor = CreatininePredictor()
     return _cr_predictor
 
 def get_inr_predictor() -> INRPredictor:
     """Get global INR predictor"""
     global _inr_predictor
     if _inr_predictor is None:
-        _inr_predictor = INRPredictor()
+        with _predictor_lock:
+            if _inr_predictor is None:
+                _inr_predictor = INRPredictor()
     return _inr_predictor
 
 def get_potassium_predictor() -> PotassiumPredictor:
     """Get global potassium predictor"""
     global _k_predictor
     if _k_predictor is None:
-        _k_predictor = PotassiumPredictor()
+        with _predictor_lock:
+            if _k_predictor is None:
+                _k_predictor = PotassiumPredictor()
     return _k_predictor
 
 
@@ -8,10 +8,14 @@ This is the ONLY file that determines which model is used for inference.
 All model selection flows through CURRENT_MODEL or explicit model_name parameter.
 """
 
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Literal, Optional, Dict, cast
+from typing import Literal, Optional, Dict, Tuple, cast
+import hashlib
 import os
 import sys
+import threading
+import time
 
 # Ensure src is in path for imports if running from root
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -97,6 +101,59 @@ def init_inference_engine():
         raise ValueError(f"Unknown backend type: {backend_type} for model {model}")
 
 
+# ── RESPONSE CACHE ───────────────────────────────────────────────
+
+class GrokLLMCache:
+    """
+    In-process exact-match cache of LLM responses.
+
+    Keyed by a SHA-256 of (model, max_tokens, system prompt, prompt); entries
+    expire after ttl seconds and the least recently used are evicted past
+    maxsize. Held in memory only: responses may contain PHI.
+    """
+
+    def __init__(self, ttl: float = 600.0, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, prompt: str, max_tokens: int, system_prompt: Optional[str]) -> str:
+        payload = "\x1f".join((model, str(max_tokens), system_prompt or "", prompt))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        if self.ttl <= 0 or not isinstance(response, str):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# GROK_RESPONSE_CACHE_TTL=0 disables caching
+_RESPONSE_CACHE = GrokLLMCache(ttl=float(os.getenv("GROK_RESPONSE_CACHE_TTL", "600")))
+
+
 # ── PRIMARY INFERENCE FUNCTION ───────────────────────────────────
 
 def grok_query(
@@ -128,13 +185,22 @@ def grok_query(
     if max_tokens is None:
         max_tokens = 2048
 
+    # Deterministic (temperature 0, non-streaming) calls are served from the
+    # response cache when the same prompt was answered recently
+    cache_key = None
+    if temperature == 0.0 and not stream:
+        cache_key = _RESPONSE_CACHE.key(llm["name"], prompt, max_tokens, system_prompt)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
     try:
         # ── Route to appropriate backend ──
 
         # ── xAI API ──
         if llm["type"] == "xai_api":
             client = llm["engine"]
-            return client.query_xai(
+            response = client.query_xai(
                 prompt,
                 model=llm["name"],
                 temperature=temperature,
@@ -146,7 +212,7 @@ def grok_query(
         # ── Azure OpenAI ──
         elif llm["type"] == "azure_openai":
             client = llm["engine"]
-            return client.query(
+            response = client.query(
                 prompt,
                 model=llm["name"],
                 temperature=temperature,
@@ -157,7 +223,7 @@ def grok_query(
         # ── Anthropic Claude ──
         elif llm["type"] == "anthropic":
             client = llm["engine"]
-            return client.query(
+            response = client.query(
                 prompt,
                 model=llm["name"],
                 temperature=temperature,
@@ -168,7 +234,7 @@ def grok_query(
         # ── Google Vertex AI ──
         elif llm["type"] == "google":
             client = llm["engine"]
-            return client.query(
+            response = client.query(
                 prompt,
                 model=llm["name"],
                 temperature=temperature,
@@ -181,7 +247,7 @@ def grok_query(
         # ── Perplexity ──
         elif llm["type"] == "perplexity":
             client = llm["engine"]
-            return client.query(
+            response = client.query(
                 prompt,
                 model=llm["name"],
                 temperature=temperature,
@@ -192,6 +258,10 @@ def grok_query(
         else:
             raise RuntimeError(f"Backend {llm['type']} not implemented")
 
+        if cache_key is not None:
+            _RESPONSE_CACHE.put(cache_key, response)
+        return response
+
     except Exception as e:
         # ── FALLBACK HANDLING ──
         from audit_log import log_fallback_event
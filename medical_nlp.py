@@ -13,6 +13,7 @@ Capabilities:
 
 from typing import Dict, List, Optional, Tuple
 import json
+import threading
 
 # scispaCy for medical NLP
 try:
@@ -84,8 +85,35 @@ class MedicalNLPProcessor:
             }
         """
 
-        doc = self.nlp(text)
+        return self._entities_from_doc(self.nlp(text))
 
+    def extract_entities_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        n_process: int = 1
+    ) -> List[Dict]:
+        """
+        Extract medical entities from many clinical texts at once
+
+        Uses nlp.pipe so tokenization and pipeline components run over
+        batches of documents instead of one call per note.
+
+        Args:
+            texts: Clinical notes or reports
+            batch_size: Documents per internal spaCy batch
+            n_process: Worker processes (each loads its own copy of the model)
+
+        Returns:
+            One entity dict per input text, same shape as extract_entities()
+        """
+        return [
+            self._entities_from_doc(doc)
+            for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        ]
+
+    def _entities_from_doc(self, doc) -> Dict:
+        """Categorize entities and abbreviations from a processed spaCy Doc"""
         entities = {
             'diseases': [],
             'drugs': [],
@@ -333,14 +361,17 @@ class MedicalNLPProcessor:
         return sections
 
 
-# Global NLP processor
+# Global NLP processor (loaded once per process; model load is several seconds)
 _nlp_processor = None
+_nlp_processor_lock = threading.Lock()
 
 def get_nlp_processor() -> MedicalNLPProcessor:
     """Get global NLP processor"""
     global _nlp_processor
     if _nlp_processor is None:
-        _nlp_processor = MedicalNLPProcessor()
+        with _nlp_processor_lock:
+            if _nlp_processor is None:
+                _nlp_processor = MedicalNLPProcessor()
     return _nlp_processor
 
 
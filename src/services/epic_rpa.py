@@ -11,15 +11,18 @@ Supports:
 - Complete audit trail logging
 """
 
+import os
 import time
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 import json
 import re
+import threading
 
 # Playwright for web automation
 try:
-    from playwright.sync_api import sync_playwright, Page, Browser
+    from playwright.sync_api import sync_playwright, Page, BrowserContext
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
@@ -95,6 +98,16 @@ class SOAPNoteParser:
         return sections
 
 
+# (soap_section_key, section tab selector, text field selector)
+SOAP_FIELD_SELECTORS = [
+    ('subjective', '#subjective_section', '#subjective_text'),
+    ('objective', '#objective_section', '#objective_text'),
+    ('assessment', '#assessment_section', '#assessment_text'),
+    ('plan', '#plan_section', '#plan_text'),
+    ('billing_code', '#billing_section', '#cpt_code'),
+]
+
+
 class EpicWebAutomation:
     """
     Epic Hyperspace (web interface) automation using Playwright
@@ -107,34 +120,67 @@ class EpicWebAutomation:
     - Saving to EHR
     """
 
-    def __init__(self, epic_url: str = "https://epic.hospital.local"):
+    def __init__(
+        self,
+        epic_url: str = "https://epic.hospital.local",
+        user_data_dir: Optional[str] = None
+    ):
         """
         Initialize Epic web automation
 
         Args:
             epic_url: Base URL for Epic Hyperspace
+            user_data_dir: Persistent browser profile directory. Cookies and SSO
+                session tokens stored here survive restarts, so login is skipped
+                while the Epic session is still valid. Defaults to
+                $EPIC_RPA_PROFILE_DIR or ~/.epic-rpa/profile.
         """
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError("Playwright required. Install with: pip install playwright")
 
         self.epic_url = epic_url
-        self.browser: Optional[Browser] = None
+        self.user_data_dir = user_data_dir or os.getenv(
+            'EPIC_RPA_PROFILE_DIR', str(Path.home() / '.epic-rpa' / 'profile')
+        )
+        self.playwright = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.logged_in = False
+
+    def start(self):
+        """Launch persistent browser context once; later calls reuse it and its page"""
+        if self.context is None:
+            # The profile holds Epic SSO cookies: owner-only access
+            profile_dir = Path(self.user_data_dir)
+            profile_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            profile_dir.chmod(0o700)
+            self.playwright = sync_playwright().start()
+            self.context = self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir,
+                headless=False,  # Show browser for physician review
+                args=['--start-maximized']
+            )
+            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+        return self
+
+    def close(self):
+        """Close browser context and stop Playwright"""
+        if self.context:
+            self.context.close()
+        if self.playwright:
+            self.playwright.stop()
+        self.playwright = None
+        self.context = None
+        self.page = None
+        self.logged_in = False
 
     def __enter__(self):
         """Context manager: launch browser"""
-        playwright = sync_playwright().start()
-        self.browser = playwright.chromium.launch(
-            headless=False,  # Show browser for physician review
-            args=['--start-maximized']
-        )
-        self.page = self.browser.new_page()
-        return self
+        return self.start()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager: close browser"""
-        if self.browser:
-            self.browser.close()
+        self.close()
 
     def login(self, username: Optional[str] = None, password: Optional[str] = None):
         """
@@ -146,6 +192,12 @@ class EpicWebAutomation:
         """
         self.page.goto(self.epic_url)
 
+        # Profile cookies still hold a valid session: Epic redirects straight to the dashboard
+        if self.page.url.startswith(f"{self.epic_url}/dashboard"):
+            self.logged_in = True
+            print("Epic session restored from browser profile")
+            return
+
         if username and password:
             # Manual login (not recommended - use SSO)
             self.page.fill('#username', username)
@@ -156,6 +208,7 @@ class EpicWebAutomation:
             print("Waiting for Windows SSO authentication...")
             self.page.wait_for_url(f"{self.epic_url}/dashboard", timeout=60000)
 
+        self.logged_in = True
         print("Epic login successful")
 
     def search_patient(self, mrn: str):
@@ -202,35 +255,13 @@ class EpicWebAutomation:
             soap_sections: Dict with subjective, objective, assessment, plan
         """
 
-        # Subjective
-        if soap_sections.get('subjective'):
-            self.page.click('#subjective_section')
-            self.page.fill('#subjective_text', soap_sections['subjective'])
-            print("Filled Subjective section")
-
-        # Objective
-        if soap_sections.get('objective'):
-            self.page.click('#objective_section')
-            self.page.fill('#objective_text', soap_sections['objective'])
-            print("Filled Objective section")
-
-        # Assessment
-        if soap_sections.get('assessment'):
-            self.page.click('#assessment_section')
-            self.page.fill('#assessment_text', soap_sections['assessment'])
-            print("Filled Assessment section")
-
-        # Plan
-        if soap_sections.get('plan'):
-            self.page.click('#plan_section')
-            self.page.fill('#plan_text', soap_sections['plan'])
-            print("Filled Plan section")
-
-        # Billing code (if available)
-        if soap_sections.get('billing_code'):
-            self.page.click('#billing_section')
-            self.page.fill('#cpt_code', soap_sections['billing_code'])
-            print(f"Set billing code: {soap_sections['billing_code']}")
+        # page.click/page.fill auto-wait for each section tab and field to be
+        # attached, visible and editable before acting on it
+        for key, section_sel, field_sel in SOAP_FIELD_SELECTORS:
+            if soap_sections.get(key):
+                self.page.click(section_sel)
+                self.page.fill(field_sel, soap_sections[key])
+                print(f"Filled {key} section")
 
     def physician_review(self) -> bool:
         """
@@ -332,6 +363,54 @@ class EpicDesktopAutomation:
         print("SOAP note filled via desktop automation")
 
 
+# Shared web sessions (browser stays open between notes), keyed by Epic URL and
+# thread: sync Playwright objects may only be used from the thread that made them
+_web_sessions: Dict[Tuple[str, int], EpicWebAutomation] = {}
+_web_sessions_lock = threading.Lock()
+
+
+def get_epic_web_session(epic_url: str = "https://epic.hospital.local") -> EpicWebAutomation:
+    """Get or create a started, logged-in Epic web session for epic_url on this thread"""
+    key = (epic_url, threading.get_ident())
+    with _web_sessions_lock:
+        session = _web_sessions.get(key)
+        if session is None:
+            session = EpicWebAutomation(epic_url)
+            _web_sessions[key] = session
+    try:
+        session.start()
+        if not session.logged_in:
+            session.login()  # Windows SSO
+    except Exception:
+        discard_epic_web_session(epic_url)
+        raise
+    return session
+
+
+def discard_epic_web_session(epic_url: str = "https://epic.hospital.local"):
+    """Close and forget this thread's session for epic_url (e.g. after a failed note)"""
+    with _web_sessions_lock:
+        session = _web_sessions.pop((epic_url, threading.get_ident()), None)
+    if session is not None:
+        try:
+            session.close()
+        except Exception as e:
+            print(f"Error closing Epic web session: {e}")
+
+
+def close_epic_web_sessions():
+    """Close all shared Epic web sessions"""
+    with _web_sessions_lock:
+        sessions = list(_web_sessions.values())
+        _web_sessions.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception as e:
+            # Sessions created on other threads may refuse to close from this one
+            print(f"Error closing Epic web session: {e}")
+
+
 def populate_epic_note(
     soap_text: str,
     mrn: str,
@@ -358,47 +437,47 @@ def populate_epic_note(
     soap_sections = parser.parse(soap_text)
 
     if use_web:
-        # Web automation (Playwright)
-        with EpicWebAutomation(epic_url) as epic:
-            try:
-                # Login (using Windows SSO)
-                epic.login()
-
-                # Search patient
-                epic.search_patient(mrn)
-
-                # Open note template
-                epic.open_new_note("Progress Note")
-
-                # Fill SOAP sections
-                epic.fill_soap_note(soap_sections)
-
-                # Physician review
-                if epic.physician_review():
-                    epic.save_note()
-
-                    # Log to audit trail
-                    log_decision(
-                        mrn=mrn,
-                        patient_context={'mrn': mrn},
-                        doctor=physician_id,
-                        question="SOAP note auto-population",
-                        labs='',
-                        answer=soap_text,
-                        bayesian_prob=1.0,  # RPA doesn't use Bayesian
-                        latency=0,
-                        analysis_mode='rpa'
-                    )
-
-                    return True
-                else:
-                    epic.discard_note()
-                    return False
-
-            except Exception as e:
-                print(f"Error during Epic automation: {e}")
+        # Web automation (Playwright); browser and SSO session are reused across notes
+        try:
+            epic = get_epic_web_session(epic_url)
+
+            # Search patient
+            epic.search_patient(mrn)
+
+            # Open note template
+            epic.open_new_note("Progress Note")
+
+            # Fill SOAP sections
+            epic.fill_soap_note(soap_sections)
+
+            # Physician review
+            if epic.physician_review():
+                epic.save_note()
+
+                # Log to audit trail
+                log_decision(
+                    mrn=mrn,
+                    patient_context={'mrn': mrn},
+                    doctor=physician_id,
+                    question="SOAP note auto-population",
+                    labs='',
+                    answer=soap_text,
+                    bayesian_prob=1.0,  # RPA doesn't use Bayesian
+                    latency=0,
+                    analysis_mode='rpa'
+                )
+
+                return True
+            else:
+                epic.discard_note()
                 return False
 
+        except Exception as e:
+            print(f"Error during Epic automation: {e}")
+            # Don't run the next note on a half-filled or broken page
+            discard_epic_web_session(epic_url)
+            return False
+
     else:
         # Desktop automation (pyautogui)
         desktop = EpicDesktopAutomation()
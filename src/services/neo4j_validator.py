@@ -12,8 +12,13 @@ Validates LLM recommendations against authoritative medical ontologies:
 """
 
 from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import atexit
+import hashlib
 import json
+import threading
+import time
 
 # Neo4j driver
 try:
@@ -24,6 +29,44 @@ except ImportError:
     print("WARNING: neo4j driver not installed. Run: pip install neo4j")
 
 
+# Process-wide driver pools keyed by (uri, username, password digest); a driver
+# is a long-lived connection pool, so every MedicalKnowledgeGraph checks sessions
+# out of one. The digest keeps a wrong password from reusing an authenticated pool.
+_DRIVERS: Dict[Tuple[str, str, bytes], "Driver"] = {}
+_DRIVERS_LOCK = threading.Lock()
+
+
+def get_shared_driver(uri: str, username: str, password: str) -> "Driver":
+    """Get (or create) the shared Neo4j driver for this URI and credentials"""
+    key = (uri, username, hashlib.sha256(password.encode('utf-8')).digest())
+    driver = _DRIVERS.get(key)
+    if driver is None:
+        with _DRIVERS_LOCK:
+            driver = _DRIVERS.get(key)
+            if driver is None:
+                driver = GraphDatabase.driver(
+                    uri,
+                    auth=(username, password),
+                    max_connection_pool_size=50,
+                    connection_acquisition_timeout=5
+                )
+                _DRIVERS[key] = driver
+                print(f"Connected to Neo4j at {uri}")
+    return driver
+
+
+def close_shared_drivers():
+    """Close every shared Neo4j driver (registered to run at interpreter exit)"""
+    with _DRIVERS_LOCK:
+        drivers = list(_DRIVERS.values())
+        _DRIVERS.clear()
+    for driver in drivers:
+        driver.close()
+
+
+atexit.register(close_shared_drivers)
+
+
 class MedicalKnowledgeGraph:
     """
     Medical knowledge graph using Neo4j
@@ -36,11 +79,19 @@ class MedicalKnowledgeGraph:
     - (LabTest)-[:MAPS_TO]->(LOINCCode)
     """
 
+    # Ontology data changes on the order of months: cache lookups in-process,
+    # shared by all instances, keyed by normalized query arguments
+    ONTOLOGY_CACHE_TTL = 3600  # seconds
+    ONTOLOGY_CACHE_MAXSIZE = 4096
+    _ontology_cache: Dict[Tuple, Tuple[float, object]] = {}
+    _ontology_cache_lock = threading.Lock()
+
     def __init__(
         self,
         uri: str = "bolt://localhost:7687",
         username: str = "neo4j",
-        password: str = "password"
+        password: str = "password",
+        driver: Optional["Driver"] = None
     ):
         """
         Initialize Neo4j connection
@@ -49,17 +100,42 @@ class MedicalKnowledgeGraph:
             uri: Neo4j bolt URI
             username: Database username
             password: Database password
+            driver: Existing driver to use (defaults to the shared process-wide driver)
         """
         if not NEO4J_AVAILABLE:
             raise ImportError("neo4j required. Install with: pip install neo4j")
 
-        self.driver: Driver = GraphDatabase.driver(uri, auth=(username, password))
-        print(f"Connected to Neo4j at {uri}")
+        self.driver: Driver = driver or get_shared_driver(uri, username, password)
 
     def close(self):
-        """Close database connection"""
-        if self.driver:
-            self.driver.close()
+        """Release this handle (shared drivers stay open until process exit)"""
+        self.driver = None
+
+    @classmethod
+    def flush_cache(cls):
+        """Drop all cached ontology lookups (forces fresh Neo4j queries)"""
+        with cls._ontology_cache_lock:
+            cls._ontology_cache.clear()
+
+    def _cached(self, key: Tuple, loader):
+        """Return cached value for key if still fresh, else call loader() and cache it"""
+        cache = MedicalKnowledgeGraph._ontology_cache
+        now = time.monotonic()
+        with MedicalKnowledgeGraph._ontology_cache_lock:
+            entry = cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        value = loader()
+
+        with MedicalKnowledgeGraph._ontology_cache_lock:
+            if len(cache) >= self.ONTOLOGY_CACHE_MAXSIZE:
+                for stale in [k for k, (expires, _) in cache.items() if expires <= now]:
+                    del cache[stale]
+                if len(cache) >= self.ONTOLOGY_CACHE_MAXSIZE:
+                    del cache[next(iter(cache))]  # Evict oldest insertion
+            cache[key] = (now + self.ONTOLOGY_CACHE_TTL, value)
+        return value
 
     def validate_indication(self, drug: str, condition: str) -> Dict:
         """
@@ -76,7 +152,11 @@ class MedicalKnowledgeGraph:
                 'guidelines': List[str]
             }
         """
+        key = ('indication', drug.lower(), condition.lower())
+        return self._cached(key, lambda: self._query_indication(drug, condition))
 
+    def _query_indication(self, drug: str, condition: str) -> Dict:
+        """Run the INDICATED_FOR lookup against Neo4j"""
         query = """
         MATCH (d:Drug {name: $drug})-[r:INDICATED_FOR]->(c:Condition {name: $condition})
         RETURN r.evidence AS evidence, r.guidelines AS guidelines
@@ -144,29 +224,27 @@ class MedicalKnowledgeGraph:
         Returns:
             List of interactions with severity
         """
+        key = ('interactions', tuple(sorted({d.lower() for d in drugs})))
+        return self._cached(key, lambda: self._query_drug_interactions(drugs))
 
+    def _query_drug_interactions(self, drugs: List[str]) -> List[Dict]:
+        """Run the INTERACTS_WITH lookup against Neo4j"""
+        # Match either edge direction once per pair (id ordering) and project
+        # only the fields callers read, already keyed as the result dicts
         query = """
-        MATCH (d1:Drug)-[r:INTERACTS_WITH]->(d2:Drug)
-        WHERE d1.name IN $drugs AND d2.name IN $drugs
+        MATCH (d1:Drug)-[r:INTERACTS_WITH]-(d2:Drug)
+        WHERE d1.name IN $drugs AND d2.name IN $drugs AND id(d1) < id(d2)
         RETURN d1.name AS drug1, d2.name AS drug2,
-               r.severity AS severity, r.mechanism AS mechanism,
-               r.clinical_effect AS effect
+               toLower(coalesce(r.severity, '')) AS severity,
+               r.mechanism AS mechanism,
+               r.clinical_effect AS clinical_effect,
+               r.management AS management
         """
 
         with self.driver.session() as session:
             result = session.run(query, drugs=[d.lower() for d in drugs])
-
-            interactions = []
-            for record in result:
-                interactions.append({
-                    'drug1': record['drug1'],
-                    'drug2': record['drug2'],
-                    'severity': record['severity'],  # major, moderate, minor
-                    'mechanism': record['mechanism'],
-                    'clinical_effect': record['effect']
-                })
-
-            return interactions
+            # severity: major, moderate, minor
+            return [record.data() for record in result]
 
     def validate_icd10(self, diagnosis: str) -> Optional[str]:
         """
@@ -253,18 +331,19 @@ class MedicalKnowledgeGraph:
             }
         """
 
-        # Check indication
-        indication = self.validate_indication(drug, diagnosis)
-
-        # Check contraindications
-        contraindications = self.check_contraindications(drug, patient_conditions)
-
-        # Check drug interactions
+        # The four lookups are independent reads: issue them concurrently
+        # (the driver is thread-safe; each query checks out its own session)
         all_drugs = [drug] + concurrent_medications
-        interactions = self.check_drug_interactions(all_drugs)
-
-        # Validate ICD-10
-        icd10 = self.validate_icd10(diagnosis)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            indication_f = executor.submit(self.validate_indication, drug, diagnosis)
+            contraindications_f = executor.submit(self.check_contraindications, drug, patient_conditions)
+            interactions_f = executor.submit(self.check_drug_interactions, all_drugs)
+            icd10_f = executor.submit(self.validate_icd10, diagnosis)
+
+            indication = indication_f.result()
+            contraindications = contraindications_f.result()
+            interactions = interactions_f.result()
+            icd10 = icd10_f.result()
 
         # Generate warnings
         warnings = []
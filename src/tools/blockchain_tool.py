@@ -9,14 +9,32 @@ from typing import Type, Dict, Any
 from pydantic import BaseModel, Field
 import sys
 import os
+import threading
 
-# Add parent directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+# Add parent directory to path (once, so module reloads don't grow sys.path)
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if _ROOT_DIR not in sys.path:
+    sys.path.append(_ROOT_DIR)
 
 # Import from root (blockchain_audit is still there)
 from blockchain_audit import BlockchainAuditLogger
 
 
+# Shared logger instance (web3 connection + contract ABI are built once)
+_audit_logger = None
+_audit_logger_lock = threading.Lock()
+
+
+def _get_audit_logger() -> BlockchainAuditLogger:
+    """Get or create the process-wide blockchain audit logger"""
+    global _audit_logger
+    if _audit_logger is None:
+        with _audit_logger_lock:
+            if _audit_logger is None:
+                _audit_logger = BlockchainAuditLogger()
+    return _audit_logger
+
+
 class BlockchainToolInput(BaseModel):
     """Input schema for blockchain audit logging"""
     action: str = Field(..., description="Action: 'log_decision', 'verify_chain', 'generate_zkp', 'export_audit'")
@@ -70,7 +88,7 @@ class BlockchainTool(BaseTool):
             decision_data = {}
 
         try:
-            logger = BlockchainAuditLogger()
+            logger = _get_audit_logger()
 
             if action == 'log_decision':
                 return self._log_decision(logger, decision_data)
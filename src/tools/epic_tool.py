@@ -5,15 +5,21 @@ Wraps epic_rpa.py for use by epic_agent
 """
 
 from crewai.tools import BaseTool
-from typing import Type, Dict, Any
-from pydantic import BaseModel, Field
+from typing import TYPE_CHECKING, Type, Dict, Any, ClassVar, Optional, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
 import sys
 import os
+import threading
+import time
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
-from src.services.epic_rpa import EpicRPAController
+from src.tools.formatting import head_with_rest
+
+# Playwright/pyautogui are imported on first use, not when the tool is declared
+if TYPE_CHECKING:
+    from src.services.epic_rpa import EpicRPAController
 
 
 class EpicToolInput(BaseModel):
@@ -44,6 +50,23 @@ class EpicTool(BaseTool):
     order labs, submit prescriptions. Requires Epic login credentials and hospital network access."""
     args_schema: Type[BaseModel] = EpicToolInput
 
+    # Controller (and its open browser session) is created once per tool instance
+    _epic: Optional["EpicRPAController"] = PrivateAttr(default=None)
+
+    # Short-lived patient cache shared across tool instances: the same MRN is
+    # usually retrieved by several agents within one crew run
+    PATIENT_CACHE_TTL: ClassVar[float] = 60.0  # seconds
+    PATIENT_CACHE_MAXSIZE: ClassVar[int] = 256
+    _patient_cache: ClassVar[Dict[str, Tuple[float, Dict[str, Any]]]] = {}
+    _patient_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def _get_epic(self) -> "EpicRPAController":
+        """Get or lazily create the Epic RPA controller"""
+        if self._epic is None:
+            from src.services.epic_rpa import EpicRPAController
+            self._epic = EpicRPAController()
+        return self._epic
+
     def _run(self, action: str, mrn: str, data: Dict[str, Any] = None) -> str:
         """
         Execute Epic EHR automation task
@@ -60,7 +83,7 @@ class EpicTool(BaseTool):
             data = {}
 
         try:
-            epic = EpicRPAController()
+            epic = self._get_epic()
 
             if action == 'populate_soap':
                 return self._populate_soap(epic, mrn, data)
@@ -98,7 +121,7 @@ Possible causes:
 Recommendation: Manual Epic entry required.
 """
 
-    def _populate_soap(self, epic: EpicRPAController, mrn: str, data: Dict[str, Any]) -> str:
+    def _populate_soap(self, epic: "EpicRPAController", mrn: str, data: Dict[str, Any]) -> str:
         """Auto-populate SOAP note in Epic"""
         soap_text = data.get('soap_text', '')
 
@@ -130,10 +153,33 @@ Error: {error}
 Recommendation: Manual note entry required.
 """
 
-    def _retrieve_patient(self, epic: EpicRPAController, mrn: str) -> str:
-        """Retrieve patient data from Epic"""
+    def _get_patient(self, epic: "EpicRPAController", mrn: str) -> Dict[str, Any]:
+        """Return patient data for mrn, served from the TTL cache when fresh"""
+        now = time.monotonic()
+        with self._patient_cache_lock:
+            entry = self._patient_cache.get(mrn)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
         patient = epic.retrieve_patient_data(mrn)
 
+        if patient.get('found'):
+            with self._patient_cache_lock:
+                if len(self._patient_cache) >= self.PATIENT_CACHE_MAXSIZE:
+                    del self._patient_cache[next(iter(self._patient_cache))]
+                self._patient_cache[mrn] = (now + self.PATIENT_CACHE_TTL, patient)
+        return patient
+
+    @classmethod
+    def invalidate_patient(cls, mrn: str) -> None:
+        """Drop cached patient data after a write changes chart state"""
+        with cls._patient_cache_lock:
+            cls._patient_cache.pop(mrn, None)
+
+    def _retrieve_patient(self, epic: "EpicRPAController", mrn: str) -> str:
+        """Retrieve patient data from Epic"""
+        patient = self._get_patient(epic, mrn)
+
         if patient.get('found'):
             return f"""=== PATIENT DATA RETRIEVED ===
 
@@ -164,7 +210,7 @@ Error: {patient.get('error', 'Patient not found in Epic')}
 Recommendation: Verify MRN or search by name/DOB.
 """
 
-    def _order_lab(self, epic: EpicRPAController, mrn: str, data: Dict[str, Any]) -> str:
+    def _order_lab(self, epic: "EpicRPAController", mrn: str, data: Dict[str, Any]) -> str:
         """Place lab order in Epic"""
         lab_name = data.get('lab_name', '')
         priority = data.get('priority', 'Routine')
@@ -173,6 +219,7 @@ Recommendation: Verify MRN or search by name/DOB.
             return "ERROR: No lab name provided. Include 'lab_name' in data parameter."
 
         result = epic.order_lab(mrn, lab_name, priority=priority)
+        self.invalidate_patient(mrn)
 
         if result.get('success'):
             return f"""=== LAB ORDER PLACED ===
@@ -196,7 +243,7 @@ Error: {result.get('error', 'Unknown error')}
 Recommendation: Manual order entry required.
 """
 
-    def _prescribe_medication(self, epic: EpicRPAController, mrn: str, data: Dict[str, Any]) -> str:
+    def _prescribe_medication(self, epic: "EpicRPAController", mrn: str, data: Dict[str, Any]) -> str:
         """Submit medication order in Epic"""
         medication = data.get('medication', '')
         dose = data.get('dose', '')
@@ -207,6 +254,7 @@ Recommendation: Manual order entry required.
             return "ERROR: Missing required fields. Include 'medication', 'dose', 'frequency' in data parameter."
 
         result = epic.prescribe_medication(mrn, medication, dose, frequency, duration)
+        self.invalidate_patient(mrn)
 
         if result.get('success'):
             return f"""=== MEDICATION ORDERED ===
@@ -232,45 +280,51 @@ Recommendation: Manual prescription entry required.
 
     def _format_medications(self, medications: list, max_items: int = 5) -> str:
         """Format medication list"""
-        if not medications:
+        head, rest = head_with_rest(medications, max_items)
+        if not head:
             return "  None active"
 
-        output = ""
-        for i, med in enumerate(medications[:max_items], 1):
-            output += f"  {i}. {med.get('name', 'Unknown')} {med.get('dose', '')} {med.get('frequency', '')}\n"
+        parts = [
+            f"  {i}. {med.get('name', 'Unknown')} {med.get('dose', '')} {med.get('frequency', '')}\n"
+            for i, med in enumerate(head, 1)
+        ]
 
-        if len(medications) > max_items:
-            output += f"  ... and {len(medications) - max_items} more\n"
+        if rest:
+            parts.append(f"  ... and {rest} more\n")
 
-        return output
+        return "".join(parts)
 
     def _format_labs(self, labs: dict, max_items: int = 5) -> str:
         """Format recent labs"""
-        if not labs:
+        head, rest = head_with_rest(labs.items(), max_items)
+        if not head:
             return "  None on file"
 
-        output = ""
-        for i, (test, value) in enumerate(list(labs.items())[:max_items], 1):
-            output += f"  {test}: {value}\n"
+        parts = [
+            f"  {test}: {value}\n"
+            for test, value in head
+        ]
 
-        if len(labs) > max_items:
-            output += f"  ... and {len(labs) - max_items} more\n"
+        if rest:
+            parts.append(f"  ... and {rest} more\n")
 
-        return output
+        return "".join(parts)
 
     def _format_problems(self, problems: list, max_items: int = 5) -> str:
         """Format problem list"""
-        if not problems:
+        head, rest = head_with_rest(problems, max_items)
+        if not head:
             return "  None on file"
 
-        output = ""
-        for i, problem in enumerate(problems[:max_items], 1):
-            output += f"  {i}. {problem.get('name', 'Unknown')} (Status: {problem.get('status', 'Active')})\n"
+        parts = [
+            f"  {i}. {problem.get('name', 'Unknown')} (Status: {problem.get('status', 'Active')})\n"
+            for i, problem in enumerate(head, 1)
+        ]
 
-        if len(problems) > max_items:
-            output += f"  ... and {len(problems) - max_items} more\n"
+        if rest:
+            parts.append(f"  ... and {rest} more\n")
 
-        return output
+        return "".join(parts)
 
 
 # Export
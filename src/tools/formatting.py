@@ -0,0 +1,31 @@
+"""
+Shared helpers for the text reports built by the CrewAI tools
+"""
+
+from typing import Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def head_with_rest(items: Iterable[T], k: int) -> Tuple[List[T], int]:
+    """
+    Split an iterable into its first k items and a count of the rest
+
+    Consumes the input exactly once, so lists, dict views, generators and
+    driver result cursors are all handled without materializing the tail.
+
+    Args:
+        items: Any iterable
+        k: Number of leading items to keep
+
+    Returns:
+        (head, rest) where head holds up to k items and rest counts the remainder
+    """
+    head: List[T] = []
+    rest = 0
+    for item in items:
+        if len(head) < k:
+            head.append(item)
+        else:
+            rest += 1
+    return head, rest
@@ -5,15 +5,27 @@ Wraps medical_imaging.py for use by imaging_agent
 """
 
 from crewai.tools import BaseTool
-from typing import Type
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Type
 from pydantic import BaseModel, Field
 import sys
 import os
+import re
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
-from src.services.monai_chexnet import get_imaging_pipeline
+# torch/MONAI are imported on first _run, not when the tool is declared
+if TYPE_CHECKING:
+    from src.services.monai_chexnet import MedicalImagingPipeline
+
+
+# Longest an X-ray call waits on the shared micro-batcher before failing over
+# to radiologist review
+XRAY_RESULT_TIMEOUT_S = 120
+
+# Critical findings requiring immediate escalation (single case-insensitive scan)
+_CRITICAL_RE = re.compile(r'pneumothorax|pulmonary\s+edema|massive\s+effusion', re.IGNORECASE)
 
 
 class MonaiToolInput(BaseModel):
@@ -50,8 +62,19 @@ class MonaiTool(BaseTool):
             Structured findings report for imaging_agent
         """
         try:
-            pipeline = get_imaging_pipeline()
-            result = pipeline.analyze_image(image_path, modality=modality)
+            from src.services.monai_chexnet import get_image_batcher, get_imaging_pipeline
+
+            if modality == "XR":
+                # X-rays go through the shared micro-batcher so concurrent agents share GPU passes
+                future = get_image_batcher().submit(image_path)
+                try:
+                    result = future.result(timeout=XRAY_RESULT_TIMEOUT_S)
+                except FutureTimeoutError:
+                    future.cancel()  # Worker skips it if the batch has not started
+                    raise TimeoutError(f"X-ray analysis timed out after {XRAY_RESULT_TIMEOUT_S}s")
+            else:
+                pipeline: "MedicalImagingPipeline" = get_imaging_pipeline()
+                result = pipeline.analyze_image(image_path, modality=modality)
 
             findings = result.get('findings', [])
             confidence = result.get('confidence', 0.0)
@@ -89,8 +112,7 @@ This AI analysis could not complete. Manual review is mandatory.
         if confidence < 0.7:
             return "Low confidence. Recommend radiologist confirmation."
 
-        critical_findings = ['pneumothorax', 'pulmonary edema', 'massive effusion']
-        if any(critical in ' '.join(findings).lower() for critical in critical_findings):
+        if _CRITICAL_RE.search(' '.join(findings)):
             return "CRITICAL FINDINGS. Immediate radiologist consultation required."
 
         return "Positive findings detected. Radiologist review recommended."
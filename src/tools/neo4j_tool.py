@@ -5,7 +5,7 @@ Wraps knowledge_graph.py for use by graph_agent
 """
 
 from crewai.tools import BaseTool
-from typing import Type, List
+from typing import TYPE_CHECKING, List, Type
 from pydantic import BaseModel, Field
 import sys
 import os
@@ -13,7 +13,13 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
-from src.services.neo4j_validator import MedicalKnowledgeGraph
+# neo4j driver is imported on first use, not when the tool is declared
+if TYPE_CHECKING:
+    from src.services.neo4j_validator import MedicalKnowledgeGraph
+
+
+# Integer severity codes used for bucketing interactions
+SEVERITY_RANK = {'major': 3, 'moderate': 2, 'minor': 1}
 
 
 class Neo4jToolInput(BaseModel):
@@ -43,6 +49,12 @@ class Neo4jTool(BaseTool):
     alternative therapies, and clinical decision support. Uses SNOMED/LOINC/ICD/RxNorm ontologies."""
     args_schema: Type[BaseModel] = Neo4jToolInput
 
+    def flush_cache(self) -> None:
+        """Force fresh knowledge graph lookups (e.g. for adversarial re-checks)"""
+        from src.services.neo4j_validator import MedicalKnowledgeGraph
+
+        MedicalKnowledgeGraph.flush_cache()
+
     def _run(
         self,
         query_type: str,
@@ -63,6 +75,8 @@ class Neo4jTool(BaseTool):
             Knowledge graph query results for graph_agent
         """
         try:
+            from src.services.neo4j_validator import MedicalKnowledgeGraph
+
             kg = MedicalKnowledgeGraph()
 
             if query_type == 'validate_indication':
@@ -95,7 +109,7 @@ Recommendation: Use clinical judgment and manual references.
 Neo4j database may not be configured or populated.
 """
 
-    def _validate_indication(self, kg: MedicalKnowledgeGraph, drug: str, condition: str) -> str:
+    def _validate_indication(self, kg: "MedicalKnowledgeGraph", drug: str, condition: str) -> str:
         """Validate drug-condition indication"""
         validation = kg.validate_indication(drug, condition)
 
@@ -132,7 +146,7 @@ Recommendation: Consider:
   3. Specialist consultation
 """
 
-    def _check_interactions(self, kg: MedicalKnowledgeGraph, medications: List[str]) -> str:
+    def _check_interactions(self, kg: "MedicalKnowledgeGraph", medications: List[str]) -> str:
         """Check drug-drug interactions"""
         interactions = kg.check_drug_interactions(medications)
 
@@ -146,45 +160,47 @@ Result: ✓ No major interactions detected
 Recommendation: Safe to proceed. Monitor as per standard protocols.
 """
 
-        # Sort by severity
-        major = [i for i in interactions if i['severity'].lower() == 'major']
-        moderate = [i for i in interactions if i['severity'].lower() == 'moderate']
-        minor = [i for i in interactions if i['severity'].lower() == 'minor']
+        # Bucket by integer severity code in one pass. The query returns each
+        # edge once (not once per direction); every edge between a pair is kept.
+        buckets = ([], [], [], [])  # other, minor, moderate, major
+        for interaction in interactions:
+            buckets[SEVERITY_RANK.get(interaction['severity'], 0)].append(interaction)
+        minor, moderate, major = buckets[1], buckets[2], buckets[3]
 
-        output = f"""=== DRUG INTERACTION CHECK ===
+        parts = [f"""=== DRUG INTERACTION CHECK ===
 
 Medications: {', '.join(medications)}
 
-"""
+"""]
         if major:
-            output += f"⚠️ MAJOR INTERACTIONS ({len(major)}):\n"
+            parts.append(f"⚠️ MAJOR INTERACTIONS ({len(major)}):\n")
             for interaction in major:
-                output += f"""
+                parts.append(f"""
   {interaction['drug1']} + {interaction['drug2']}
   Mechanism: {interaction['mechanism']}
   Effect: {interaction['clinical_effect']}
-  Management: {interaction.get('management', 'Avoid combination or monitor closely')}
-"""
+  Management: {interaction.get('management') or 'Avoid combination or monitor closely'}
+""")
 
         if moderate:
-            output += f"\n⚠ Moderate Interactions ({len(moderate)}):\n"
+            parts.append(f"\n⚠ Moderate Interactions ({len(moderate)}):\n")
             for interaction in moderate[:3]:  # Show top 3
-                output += f"  - {interaction['drug1']} + {interaction['drug2']}: {interaction['clinical_effect']}\n"
+                parts.append(f"  - {interaction['drug1']} + {interaction['drug2']}: {interaction['clinical_effect']}\n")
 
         if minor:
-            output += f"\nMinor Interactions: {len(minor)} detected\n"
+            parts.append(f"\nMinor Interactions: {len(minor)} detected\n")
 
-        output += f"\nRecommendation: "
+        parts.append("\nRecommendation: ")
         if major:
-            output += "MAJOR INTERACTIONS DETECTED. Consider alternative therapy or intensive monitoring."
+            parts.append("MAJOR INTERACTIONS DETECTED. Consider alternative therapy or intensive monitoring.")
         elif moderate:
-            output += "Monitor for interaction effects. Dose adjustment may be needed."
+            parts.append("Monitor for interaction effects. Dose adjustment may be needed.")
         else:
-            output += "Minor interactions only. Routine monitoring."
+            parts.append("Minor interactions only. Routine monitoring.")
 
-        return output
+        return "".join(parts)
 
-    def _find_alternatives(self, kg: MedicalKnowledgeGraph, drug: str, condition: str) -> str:
+    def _find_alternatives(self, kg: "MedicalKnowledgeGraph", drug: str, condition: str) -> str:
         """Find alternative therapies"""
         alternatives = kg.find_alternative_therapies(drug, condition)
 
@@ -198,21 +214,21 @@ Result: No alternatives found in knowledge graph.
 Recommendation: Consult clinical guidelines or specialist for alternatives.
 """
 
-        output = f"""=== ALTERNATIVE THERAPIES ===
+        parts = [f"""=== ALTERNATIVE THERAPIES ===
 
 Current: {drug} for {condition}
 
 Alternatives:
-"""
+"""]
         for alt in alternatives[:5]:  # Top 5
-            output += f"""
+            parts.append(f"""
   {alt['drug_name']}
     Evidence Level: {alt.get('evidence_level', 'Unknown')}
     Efficacy: {alt.get('efficacy_vs_standard', 'Comparable')}
     Safety Profile: {alt.get('safety_profile', 'Similar')}
-"""
+""")
 
-        return output
+        return "".join(parts)
 
 
 # Export
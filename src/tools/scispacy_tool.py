@@ -5,16 +5,66 @@ Wraps medical_nlp.py for use by nlp_agent
 """
 
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Any, Type
 from pydantic import BaseModel, Field
 import sys
 import os
+import threading
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
-# Import from root (medical_nlp is still there)
-from medical_nlp import get_nlp_pipeline, extract_clinical_entities
+from src.tools.formatting import head_with_rest
+
+# medical_nlp (spaCy/scispaCy) is imported on first use, not when the tool is declared
+
+
+def _nlp():
+    """Get the process-wide MedicalNLPProcessor, loading the model on first use"""
+    # Import from root (medical_nlp is still there)
+    from medical_nlp import get_nlp_processor
+    return get_nlp_processor()
+
+
+_WARMUP_STARTED = False
+_WARMUP_LOCK = threading.Lock()
+
+
+def _start_warmup():
+    """Load the model in the background once per process, so the first tool call doesn't pay for it"""
+    global _WARMUP_STARTED
+    with _WARMUP_LOCK:
+        if _WARMUP_STARTED:
+            return
+        _WARMUP_STARTED = True
+    threading.Thread(target=_warmup_nlp, name="scispacy-warmup", daemon=True).start()
+
+
+def _warmup_nlp():
+    """Background target: load the model, leaving errors for the first real call"""
+    try:
+        _nlp()
+    except Exception:
+        pass  # Surfaced to the caller on the first real _run instead
+
+
+def _clinical_entities(processor, text: str) -> dict:
+    """Map MedicalNLPProcessor output onto the report's entity categories"""
+    entities = processor.extract_entities(text)
+
+    def top_cui(ent: dict) -> str:
+        return ent['umls_codes'][0]['cui'] if ent.get('umls_codes') else 'N/A'
+
+    return {
+        'medications': [{'text': ent['text'], 'cui': top_cui(ent)} for ent in entities['drugs']],
+        'diagnoses': [{'text': ent['text']} for ent in entities['diseases']],
+        'procedures': [{'text': ent['text']} for ent in entities['procedures']],
+        'lab_values': [{'test': name, 'value': value} for name, value in processor.extract_labs(text).items()],
+        'umls_concepts': [
+            {'cui': ent['umls_codes'][0]['cui'], 'name': ent['umls_codes'][0]['name']}
+            for ent in entities['all_entities'] if ent.get('umls_codes')
+        ],
+    }
 
 
 class ScispacyToolInput(BaseModel):
@@ -44,6 +94,11 @@ class ScispacyTool(BaseTool):
     Processes physician notes, transcripts, and clinical documentation."""
     args_schema: Type[BaseModel] = ScispacyToolInput
 
+    def model_post_init(self, __context: Any) -> None:
+        """Start loading the shared model when the tool is built, not when the module is imported"""
+        super().model_post_init(__context)
+        _start_warmup()
+
     def _run(self, clinical_text: str, extract_type: str = "all") -> str:
         """
         Extract clinical entities using sciSpaCy
@@ -56,8 +111,7 @@ class ScispacyTool(BaseTool):
             Structured entity extraction report for nlp_agent
         """
         try:
-            nlp = get_nlp_pipeline()
-            entities = extract_clinical_entities(clinical_text, nlp)
+            entities = _clinical_entities(_nlp(), clinical_text)
 
             if extract_type == "all":
                 return self._format_all_entities(entities, clinical_text)
@@ -115,111 +169,107 @@ Recommendation: Review extracted entities for accuracy.
         """Format medication entities"""
         meds = entities.get('medications', [])
 
-        output = f"""=== MEDICATION EXTRACTION ===
+        parts = [f"""=== MEDICATION EXTRACTION ===
 
 Total Medications: {len(meds)}
 
-"""
+"""]
         for med in meds:
-            output += f"""  • {med['text']}
+            parts.append(f"""  • {med['text']}
     Dose: {med.get('dose', 'Not specified')}
     Route: {med.get('route', 'Not specified')}
     Frequency: {med.get('frequency', 'Not specified')}
     UMLS CUI: {med.get('cui', 'N/A')}
 
-"""
+""")
         if not meds:
-            output += "  No medications detected.\n"
+            parts.append("  No medications detected.\n")
 
-        return output
+        return "".join(parts)
 
     def _format_diagnoses(self, entities: dict) -> str:
         """Format diagnosis entities"""
         diagnoses = entities.get('diagnoses', [])
 
-        output = f"""=== DIAGNOSIS EXTRACTION ===
+        parts = [f"""=== DIAGNOSIS EXTRACTION ===
 
 Total Diagnoses: {len(diagnoses)}
 
-"""
-        for dx in diagnoses:
-            output += f"  • {dx['text']} (ICD-10: {dx.get('icd_code', 'N/A')})\n"
+"""]
+        parts.extend(f"  • {dx['text']} (ICD-10: {dx.get('icd_code', 'N/A')})\n" for dx in diagnoses)
 
         if not diagnoses:
-            output += "  No diagnoses detected.\n"
+            parts.append("  No diagnoses detected.\n")
 
-        return output
+        return "".join(parts)
 
     def _format_procedures(self, entities: dict) -> str:
         """Format procedure entities"""
         procedures = entities.get('procedures', [])
 
-        output = f"""=== PROCEDURE EXTRACTION ===
+        parts = [f"""=== PROCEDURE EXTRACTION ===
 
 Total Procedures: {len(procedures)}
 
-"""
-        for proc in procedures:
-            output += f"  • {proc['text']} (CPT: {proc.get('cpt_code', 'N/A')})\n"
+"""]
+        parts.extend(f"  • {proc['text']} (CPT: {proc.get('cpt_code', 'N/A')})\n" for proc in procedures)
 
         if not procedures:
-            output += "  No procedures detected.\n"
+            parts.append("  No procedures detected.\n")
 
-        return output
+        return "".join(parts)
 
     def _format_labs(self, entities: dict) -> str:
         """Format lab value entities"""
         labs = entities.get('lab_values', [])
 
-        output = f"""=== LAB VALUE EXTRACTION ===
+        parts = [f"""=== LAB VALUE EXTRACTION ===
 
 Total Lab Values: {len(labs)}
 
-"""
+"""]
         for lab in labs:
-            output += f"""  • {lab['test']}: {lab['value']} {lab.get('unit', '')}
+            parts.append(f"""  • {lab['test']}: {lab['value']} {lab.get('unit', '')}
     LOINC: {lab.get('loinc_code', 'N/A')}
     Reference Range: {lab.get('reference_range', 'N/A')}
 
-"""
+""")
         if not labs:
-            output += "  No lab values detected.\n"
+            parts.append("  No lab values detected.\n")
 
-        return output
+        return "".join(parts)
 
     def _format_list(self, items: list, max_items: int = 5) -> str:
         """Format list of items"""
-        if not items:
+        head, rest = head_with_rest(items, max_items)
+        if not head:
             return "  None detected"
 
-        output = ""
-        for i, item in enumerate(items[:max_items], 1):
-            if isinstance(item, dict):
-                output += f"  {i}. {item.get('text', str(item))}\n"
-            else:
-                output += f"  {i}. {item}\n"
+        parts = [
+            f"  {i}. {item.get('text', str(item)) if isinstance(item, dict) else item}\n"
+            for i, item in enumerate(head, 1)
+        ]
 
-        if len(items) > max_items:
-            output += f"  ... and {len(items) - max_items} more\n"
+        if rest:
+            parts.append(f"  ... and {rest} more\n")
 
-        return output
+        return "".join(parts)
 
     def _format_umls(self, concepts: list, max_concepts: int = 5) -> str:
         """Format UMLS concept list"""
-        if not concepts:
+        head, rest = head_with_rest(concepts, max_concepts)
+        if not head:
             return "  None detected"
 
-        output = ""
-        for concept in concepts[:max_concepts]:
-            cui = concept.get('cui', 'N/A')
-            name = concept.get('name', 'Unknown')
-            semantic_type = concept.get('semantic_type', 'N/A')
-            output += f"  {cui}: {name} ({semantic_type})\n"
+        parts = [
+            f"  {concept.get('cui', 'N/A')}: {concept.get('name', 'Unknown')} ({concept.get('semantic_type', 'N/A')})\n"
+            for concept in head
+        ]
 
-        if len(concepts) > max_concepts:
-            output += f"  ... and {len(concepts) - max_concepts} more\n"
+        if rest:
+            parts.append(f"  ... and {rest} more\n")
 
-        return output
+        return "".join(parts)
 
 
 # Export
@@ -5,8 +5,9 @@ Wraps lab_predictions.py for use by lab_agent
 """
 
 from crewai.tools import BaseTool
-from typing import Type, Dict, Any
+from typing import ClassVar, Type, Dict, Any, List
 from pydantic import BaseModel, Field
+import re
 import sys
 import os
 
@@ -16,6 +17,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 # Import from root directory (lab_predictions is still there)
 from lab_predictions import get_creatinine_predictor, get_inr_predictor
 
+# Medications that move K+, matched in one case-insensitive scan
+_K_SPARING = frozenset({'spironolactone', 'amiloride', 'eplerenone', 'triamterene'})
+_LOOP_DIURETICS = frozenset({'furosemide', 'torsemide', 'bumetanide'})
+_K_MED_RE = re.compile('|'.join(sorted(_K_SPARING | _LOOP_DIURETICS)), re.IGNORECASE)
+
 
 class XGBoostToolInput(BaseModel):
     """Input schema for XGBoost lab predictor"""
@@ -42,6 +48,23 @@ class XGBoostTool(BaseTool):
     Returns predicted values, percent change, and risk assessment."""
     args_schema: Type[BaseModel] = XGBoostToolInput
 
+    # lab_type -> formatter method, applied only when emitting text to the agent
+    _FORMATTERS: ClassVar[Dict[str, str]] = {
+        'creatinine': '_format_creatinine',
+        'inr': '_format_inr',
+        'potassium': '_format_potassium',
+    }
+
+    def model_post_init(self, __context: Any) -> None:
+        """Build the process-wide predictors with the tool, not on the first prediction"""
+        super().model_post_init(__context)
+        try:
+            get_creatinine_predictor()
+            get_inr_predictor()
+        except ImportError:
+            # xgboost missing: _run reports the error per call
+            pass
+
     def _run(self, patient_data: Dict[str, Any], lab_type: str) -> str:
         """
         Predict lab values using XGBoost models
@@ -53,18 +76,9 @@ class XGBoostTool(BaseTool):
         Returns:
             Prediction summary with risk assessment for lab_agent
         """
-        try:
-            if lab_type.lower() == 'creatinine':
-                return self._predict_creatinine(patient_data)
-
-            elif lab_type.lower() == 'inr':
-                return self._predict_inr(patient_data)
-
-            elif lab_type.lower() == 'potassium':
-                return self._predict_potassium(patient_data)
-
-            else:
-                return f"""=== LAB PREDICTION ERROR ===
+        lab = lab_type.lower()
+        if lab not in self._FORMATTERS:
+            return f"""=== LAB PREDICTION ERROR ===
 Unsupported lab type: '{lab_type}'
 
 Supported types:
@@ -73,6 +87,9 @@ Supported types:
   - potassium (electrolyte trend)
 """
 
+        try:
+            return self._format(lab, self.predict(patient_data, lab))
+
         except Exception as e:
             return f"""=== LAB PREDICTION FAILED ===
 Error: {str(e)}
@@ -80,11 +97,59 @@ Error: {str(e)}
 Recommendation: Use clinical judgment and standard monitoring protocols.
 """
 
-    def _predict_creatinine(self, patient_data: Dict[str, Any]) -> str:
+    def predict(self, patient_data: Dict[str, Any], lab_type: str) -> Dict[str, Any]:
+        """
+        Predict a lab value and return the structured result (no text formatting)
+
+        Args:
+            patient_data: Patient data dict with demographics, labs, medications
+            lab_type: 'creatinine', 'inr', or 'potassium'
+
+        Returns:
+            Prediction dict (keys depend on lab_type)
+        """
+        lab = lab_type.lower()
+        if lab == 'creatinine':
+            return self._predict_creatinine(patient_data)
+        elif lab == 'inr':
+            return self._predict_inr(patient_data)
+        elif lab == 'potassium':
+            return self._predict_potassium(patient_data)
+        raise ValueError(f"Unsupported lab type: '{lab_type}'")
+
+    def predict_batch(self, patients: List[Dict[str, Any]], lab_type: str) -> List[Dict[str, Any]]:
+        """
+        Predict the same lab for many patients at once
+
+        Creatinine features are packed into one matrix and scored with a single
+        model call; INR and potassium are closed-form and run per patient.
+
+        Args:
+            patients: List of patient data dicts
+            lab_type: 'creatinine', 'inr', or 'potassium'
+
+        Returns:
+            One prediction dict per patient, in input order
+        """
+        if lab_type.lower() == 'creatinine':
+            try:
+                return get_creatinine_predictor().predict_creatinine_24h_batch(patients)
+            except Exception:
+                # Fall back to per-patient calls so the failing record is the one that raises
+                pass
+        return [self.predict(patient_data, lab_type) for patient_data in patients]
+
+    def _format(self, lab_type: str, result: Dict[str, Any]) -> str:
+        """Format a prediction dict from predict() for lab_agent"""
+        return getattr(self, self._FORMATTERS[lab_type.lower()])(result)
+
+    def _predict_creatinine(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict creatinine and AKI risk"""
         predictor = get_creatinine_predictor()
-        result = predictor.predict_creatinine_24h(patient_data)
+        return predictor.predict_creatinine_24h(patient_data)
 
+    def _format_creatinine(self, result: Dict[str, Any]) -> str:
+        """Format a creatinine prediction for lab_agent"""
         baseline = result.get('baseline_cr', 0.0)
         predicted = result.get('predicted_cr', 0.0)
         change = result.get('percent_change', 0.0)
@@ -103,7 +168,7 @@ Confidence:   {confidence:.1%}
 Recommendation: {self._get_aki_recommendation(aki_risk, change)}
 """
 
-    def _predict_inr(self, patient_data: Dict[str, Any]) -> str:
+    def _predict_inr(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict INR response to warfarin dose change"""
         predictor = get_inr_predictor()
 
@@ -111,8 +176,10 @@ Recommendation: {self._get_aki_recommendation(aki_risk, change)}
         current_dose = patient_data.get('drug_dose_mg', 5.0)
         new_dose = patient_data.get('new_dose_mg', 5.0)
 
-        result = predictor.predict_inr(current_inr, current_dose, new_dose)
+        return predictor.predict_inr(current_inr, current_dose, new_dose)
 
+    def _format_inr(self, result: Dict[str, Any]) -> str:
+        """Format an INR prediction for lab_agent"""
         return f"""=== INR PREDICTION (3 days) ===
 
 Current INR:     {result['current_inr']:.1f}
@@ -124,26 +191,33 @@ Over-anticoag Risk: {result['over_anticoagulation_risk'].upper()}
 Recommendation: {self._get_inr_recommendation(result['predicted_inr'])}
 """
 
-    def _predict_potassium(self, patient_data: Dict[str, Any]) -> str:
+    def _predict_potassium(self, patient_data: Dict[str, Any]) -> Dict[str, Any]:
         """Predict potassium trend (simplified model)"""
         # Simplified potassium prediction
         baseline_k = patient_data.get('labs', {}).get('potassium', 4.0)
 
         # Check for medications affecting K+
         meds = patient_data.get('medications', [])
-        k_sparing = any('spironolactone' in m.lower() or 'amiloride' in m.lower() for m in meds)
-        loop_diuretic = any('furosemide' in m.lower() or 'torsemide' in m.lower() for m in meds)
+        found = {m.group().lower() for m in _K_MED_RE.finditer('\n'.join(meds))}
 
-        if k_sparing:
+        if found & _K_SPARING:
             predicted_k = baseline_k + 0.3
             trend = "RISING"
-        elif loop_diuretic:
+        elif found & _LOOP_DIURETICS:
             predicted_k = baseline_k - 0.4
             trend = "FALLING"
         else:
             predicted_k = baseline_k
             trend = "STABLE"
 
+        return {'baseline_k': baseline_k, 'predicted_k': predicted_k, 'trend': trend}
+
+    def _format_potassium(self, result: Dict[str, Any]) -> str:
+        """Format a potassium prediction for lab_agent"""
+        baseline_k = result['baseline_k']
+        predicted_k = result['predicted_k']
+        trend = result['trend']
+
         return f"""=== POTASSIUM PREDICTION (24h) ===
 
 Baseline K+:  {baseline_k:.1f} mEq/L
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import random
+import re
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disease_discovery import DiseaseDiscoveryEngine, get_discovery_engine
+
+
+def reference_analyze(engine, text, meds, labs):
+    """The original per-pattern re.search implementation, kept as the oracle"""
+    discovered = {}
+
+    text_lower = text.lower()
+    for condition, patterns in engine.patterns.items():
+        for pattern in patterns:
+            match = re.search(pattern, text_lower)
+            if match:
+                start = max(0, match.start() - 20)
+                context = text_lower[start:match.start()]
+                if not any(neg in context for neg in ['no ', 'not ', 'denies ', 'negative for ']):
+                    discovered.setdefault(condition, []).append('NLP (Note)')
+                    break
+
+    meds_lower = [m.lower() for m in meds]
+    for condition, triggers in engine.med_rules.items():
+        found_meds = [m for m in meds_lower if any(t in m for t in triggers)]
+        if found_meds:
+            discovered.setdefault(condition, []).append(f'Inferred from Meds ({", ".join(found_meds)})')
+
+    labs_norm = {k.lower(): v for k, v in labs.items()}
+    for condition, name, threshold, op in [
+        ('Diabetes', 'a1c', 6.5, '>'),
+        ('CKD Stage 3+', 'gfr', 60, '<'),
+        ('Anemia', 'hgb', 12, '<'),
+        ('Hyperkalemia', 'potassium', 5.5, '>'),
+    ]:
+        val = next((v for k, v in labs_norm.items() if name in k), None)
+        if val is not None and (val > threshold if op == '>' else val < threshold):
+            discovered.setdefault(condition, []).append('Inferred from Labs')
+
+    return discovered
+
+
+class TestDiseaseDiscoveryEquivalence(unittest.TestCase):
+    def setUp(self):
+        self.engine = DiseaseDiscoveryEngine()
+
+    def _vocabulary(self):
+        words = [
+            p.replace('\\b', '')
+            for patterns in self.engine.patterns.values()
+            for p in patterns
+        ]
+        return words + [
+            'no', 'not', 'denies', 'negative for', 'pt', 'on', 'oxygen.', 'tobacco',
+            'use.', 'Morbid', 'Congestive', 'HTN', 'history', 'of', 'and', 'İ', '.', ',',
+        ]
+
+    def test_notes_match_reference(self):
+        words = self._vocabulary()
+        rng = random.Random(1)
+        for _ in range(5000):
+            text = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 14)))
+            self.assertEqual(self.engine._analyze(text, [], {}),
+                             reference_analyze(self.engine, text, [], {}), text)
+
+    def test_meds_and_labs_match_reference(self):
+        triggers = [t for ts in self.engine.med_rules.values() for t in ts]
+        lab_names = ['HbA1c', 'a1c', 'eGFR', 'Hgb', 'Potassium', 'Creatinine']
+        rng = random.Random(2)
+        for _ in range(2000):
+            meds = [rng.choice(triggers).title() + rng.choice(['', ' 10mg', 'XR'])
+                    for _ in range(rng.randint(0, 4))]
+            labs = {name: round(rng.uniform(0, 100) if 'gfr' in name.lower() else rng.uniform(0, 12), 1)
+                    for name in rng.sample(lab_names, rng.randint(0, 3))}
+            self.assertEqual(self.engine._analyze('', meds, labs),
+                             reference_analyze(self.engine, '', meds, labs), (meds, labs))
+
+    def test_analyze_cache_returns_copies(self):
+        note = "History of hypertension and morbid obesity. No diabetes."
+        first = self.engine.analyze(note, ["Lisinopril"], {"HbA1c": 7.2})
+        first['Hypertension'].append('mutated')
+        second = self.engine.analyze(note, ["Lisinopril"], {"HbA1c": 7.2})
+        self.assertEqual(second, reference_analyze(self.engine, note, ["Lisinopril"], {"HbA1c": 7.2}))
+
+    def test_shared_engine(self):
+        self.assertIs(get_discovery_engine(), get_discovery_engine())
+
+
+if __name__ == '__main__':
+    unittest.main()
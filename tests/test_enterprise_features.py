@@ -52,6 +52,16 @@ class TestHCCAndRiskAdjustment(unittest.TestCase):
         self.assertGreater(len(engine.icd_map), 3000)
         self.assertIn('E11.05', engine.icd_map)
         self.assertIn('C99.9', engine.icd_map)
+
+    def test_hcc_code_normalization(self):
+        """Undotted/lowercase codes map; near-misses of table codes stay unmapped"""
+        engine = HCCEngine()
+        for code in ['E119', 'e11.9', 'E11.9']:
+            self.assertEqual(engine.calculate_raf(72, 'M', [code])['hcc_count'], 1, code)
+        for code in ['I48.19', 'I21.09', 'I4819', 'C34.19']:
+            result = engine.calculate_raf(72, 'M', [code])
+            self.assertEqual(result['hcc_count'], 0, code)
+            self.assertAlmostEqual(result['raf_score'], 0.35, places=3)
     
     def test_batch_raf_scoring(self):
         """v6.5: Test batch processing"""
@@ -72,7 +82,13 @@ class TestHCCAndRiskAdjustment(unittest.TestCase):
         self.assertIn('Hypertension', results)
         self.assertIn('Obesity', results)
         self.assertNotIn('Diabetes', results)
-    
+
+    def test_disease_discovery_negated_long_mention(self):
+        """A negated long mention must not hide the shorter pattern inside it"""
+        engine = DiseaseDiscoveryEngine()
+        self.assertIn('CHF', engine.analyze("Pt not on oxygen. Congestive heart failure", [], {}))
+        self.assertIn('Obesity', engine.analyze("No tobacco use. Morbid obesity", [], {}))
+
     def test_meat_compliance(self):
         """Test M.E.A.T. documentation validation"""
         validator = MEATValidator()
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import json
+import threading
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import grok_orchestrator
+from grok_orchestrator import GrokOrchestrator
+
+
+class FakeGrok:
+    """Stands in for local_inference.grok_query; records every call by model"""
+
+    def __init__(self, routing='["gpt-4-turbo", "claude-3-5-sonnet"]', fail=(), route_error=None):
+        self.routing = routing
+        self.fail = set(fail)
+        self.route_error = route_error
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, model_name=None, temperature=None, system_prompt=None):
+        with self._lock:
+            self.calls.append(model_name)
+        if model_name == "grok-beta":
+            if "orchestrator AI" in prompt:
+                if self.route_error:
+                    raise self.route_error
+                return self.routing
+            return json.dumps({"final_recommendation": "ok", "confidence": 0.9})
+        if model_name in self.fail:
+            raise RuntimeError(f"{model_name} unavailable")
+        return json.dumps({"rec": f"{model_name} rec", "evidence": ["a", "b", "c", "d"], "confidence": 0.8})
+
+    def consultant_calls(self):
+        return [m for m in self.calls if m != "grok-beta"]
+
+
+class TestGrokOrchestrator(unittest.TestCase):
+    def setUp(self):
+        env = mock.patch.dict(os.environ, {"XAI_API_KEY": "test-key"})
+        env.start()
+        self.addCleanup(env.stop)
+        GrokOrchestrator._routing_cache.clear()
+        self.addCleanup(GrokOrchestrator._routing_cache.clear)
+
+    def _run(self, fake, prompt="55M with chest pain", speculative=0):
+        with mock.patch.object(grok_orchestrator, "grok_query", fake), \
+             mock.patch.object(GrokOrchestrator, "SPECULATIVE_CONSULTANTS", speculative):
+            return GrokOrchestrator().consult_and_decide(prompt)
+
+    def test_routed_consultants_queried(self):
+        fake = FakeGrok()
+        result = self._run(fake)
+        self.assertEqual(result["consultants_used"], ["gpt-4-turbo", "claude-3-5-sonnet"])
+        self.assertEqual(sorted(fake.consultant_calls()), ["claude-3-5-sonnet", "gpt-4-turbo"])
+        self.assertEqual(result["consultant_responses"]["gpt-4-turbo"], json.dumps(
+            {"rec": "gpt-4-turbo rec", "evidence": ["a", "b", "c", "d"], "confidence": 0.8}))
+        self.assertIn("final_recommendation", result["grok_final_decision"])
+
+    def test_consultant_exception_becomes_error_entry(self):
+        fake = FakeGrok(fail={"claude-3-5-sonnet"})
+        result = self._run(fake)
+        self.assertEqual(result["consultant_responses"]["claude-3-5-sonnet"],
+                         "ERROR: claude-3-5-sonnet unavailable")
+        self.assertFalse(result["consultant_responses"]["gpt-4-turbo"].startswith("ERROR"))
+        self.assertIn("final_recommendation", result["grok_final_decision"])
+
+    def test_unparseable_routing_uses_defaults(self):
+        fake = FakeGrok(routing="consult everyone")
+        result = self._run(fake)
+        self.assertEqual(result["consultants_used"], ["gpt-4-turbo", "claude-3-5-sonnet", "gemini-pro"])
+        # Unparsed decisions are not cached
+        self.assertEqual(len(GrokOrchestrator._routing_cache), 0)
+
+    def test_routing_decision_cached(self):
+        fake = FakeGrok()
+        self._run(fake)
+        self._run(fake)
+        routing_calls = fake.calls.count("grok-beta")
+        self.assertEqual(routing_calls, 3)  # one routing call, two final decisions
+
+    def test_routing_failure_propagates(self):
+        fake = FakeGrok(route_error=RuntimeError("xAI down"))
+        with self.assertRaisesRegex(RuntimeError, "xAI down"):
+            self._run(fake)
+        self.assertEqual(fake.consultant_calls(), [])
+
+    def test_routing_failure_cancels_speculative_calls(self):
+        fake = FakeGrok(route_error=RuntimeError("xAI down"))
+        with self.assertRaisesRegex(RuntimeError, "xAI down"):
+            self._run(fake, speculative=2)
+        # Any speculative call that started was to the default roster only
+        self.assertTrue(set(fake.consultant_calls()) <= {"gpt-4-turbo", "claude-3-5-sonnet"})
+
+    def test_speculative_calls_reused_and_unpicked_dropped(self):
+        fake = FakeGrok(routing='["claude-3-5-sonnet", "gemini-pro"]')
+        result = self._run(fake, speculative=2)
+        self.assertEqual(set(result["consultant_responses"]), {"claude-3-5-sonnet", "gemini-pro"})
+        calls = fake.consultant_calls()
+        # The speculative claude call is reused, not repeated
+        self.assertEqual(calls.count("claude-3-5-sonnet"), 1)
+        self.assertEqual(calls.count("gemini-pro"), 1)
+        self.assertLessEqual(calls.count("gpt-4-turbo"), 1)
+
+    def test_condense_structured_and_plain(self):
+        with mock.patch.object(GrokOrchestrator, "CONSULTANT_RESPONSE_MAX_CHARS", 10):
+            orchestrator = GrokOrchestrator()
+            self.assertEqual(
+                orchestrator._condense('{"rec": "start aspirin now", "evidence": [1, 2, 3, 4], "confidence": 0.7}'),
+                {"rec": "start aspi", "evidence": [1, 2, 3], "confidence": 0.7}
+            )
+            self.assertEqual(orchestrator._condense("plain text answer"), "plain text")
+
+
+if __name__ == '__main__':
+    unittest.main()
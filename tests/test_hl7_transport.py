@@ -0,0 +1,163 @@
+import unittest
+import sys
+import os
+import socket
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hl7_transport import HL7Message, HL7MessageBuilder, MLLPServer, SB, EB, CR
+
+
+def _hl7(control_id, extra=""):
+    return (
+        f"MSH|^~\\&|Lab|Fac|Grok|Fac|20251128||ORU^R01|{control_id}|P|2.5\r"
+        f"PID|||12345||Doe^John||19800101|M\r{extra}"
+    )
+
+
+def _frame(msg):
+    return SB + msg.encode('utf-8') + EB + CR
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _recv_acks(sock, count, timeout=5.0):
+    """Read until `count` MLLP-framed ACKs arrived; returns their control ids"""
+    sock.settimeout(timeout)
+    data = b''
+    while data.count(EB) < count:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    acks = [frame.strip(SB + CR) for frame in data.split(EB + CR) if frame.strip(SB + CR)]
+    return [ack.decode('utf-8').split('\r')[1].split('|')[2] for ack in acks]
+
+
+class TestHL7Message(unittest.TestCase):
+    def test_fields_match_parse_message(self):
+        raw = _hl7("MSG001", "OBX|1|NM|K^Potassium||5.9|mmol/L\r")
+        msg = HL7Message(raw.encode('utf-8'))
+        parsed = HL7MessageBuilder.parse_message(raw)
+
+        self.assertEqual(len(msg), 3)
+        for i, seg in enumerate(parsed['segments']):
+            for j, value in enumerate(seg['fields']):
+                self.assertEqual(msg.field(i, j), value)
+        self.assertEqual(msg.segment_type(2), 'OBX')
+        self.assertEqual(msg.find_segments('OBX'), [2])
+        self.assertEqual(bytes(msg.segment(1)), b'PID|||12345||Doe^John||19800101|M')
+
+    def test_short_segment(self):
+        msg = HL7Message(b'MSH|^~\\&|Lab\rPID|1\r')
+        self.assertEqual(msg.field(1, 1), '1')
+        self.assertEqual(msg.field(1, 2), '')
+        self.assertEqual(msg.field(1, 9), '')
+        # A short segment must not read into the next one
+        self.assertEqual(msg.field(0, 3), '')
+
+    def test_no_trailing_cr(self):
+        msg = HL7Message(b'MSH|^~\\&|Lab|Fac\rPID|||12345')
+        self.assertEqual(len(msg), 2)
+        self.assertEqual(msg.field(1, 3), '12345')
+        self.assertEqual(bytes(msg.segment(1)), b'PID|||12345')
+        self.assertEqual(msg.find_segments('PID'), [1])
+
+    def test_empty_message(self):
+        msg = HL7Message(b'')
+        self.assertEqual(len(msg), 0)
+        self.assertEqual(msg.find_segments('MSH'), [])
+
+    def test_ack_for_matches_create_ack(self):
+        raw = _hl7("MSG042")
+        self.assertEqual(
+            HL7MessageBuilder.create_ack_for(HL7Message(raw.encode('utf-8'))),
+            HL7MessageBuilder.create_ack(raw)
+        )
+
+
+class TestMLLPServer(unittest.TestCase):
+    def _start(self, lazy_parse):
+        server = MLLPServer(host='127.0.0.1', port=_free_port(), lazy_parse=lazy_parse)
+        server.start()
+        self.addCleanup(server.stop)
+        for _ in range(50):
+            try:
+                return server, socket.create_connection(('127.0.0.1', server.port), timeout=5)
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+        self.fail("MLLP server did not start")
+
+    def _control_ids(self, server):
+        if server.lazy_parse:
+            return [m.field(0, 9) for m in server.messages]
+        return [m['control_id'] for m in server.messages]
+
+    def test_multi_frame_framing(self):
+        for lazy_parse in (False, True):
+            with self.subTest(lazy_parse=lazy_parse):
+                server, client = self._start(lazy_parse)
+                big_obx = ''.join(f"OBX|{i}|NM|GLU||{i}|mg/dL\r" for i in range(5000))
+                ids = ['PIPE1', 'PIPE2', 'SPLIT', 'BIG']
+                with client:
+                    # Two frames pipelined in one write
+                    client.sendall(_frame(_hl7(ids[0])) + _frame(_hl7(ids[1])))
+                    self.assertEqual(_recv_acks(client, 2), ids[:2])
+
+                    # One frame split across writes, including between EB and CR
+                    payload = _frame(_hl7(ids[2]))
+                    for part in (payload[:7], payload[7:-2], payload[-2:-1], payload[-1:]):
+                        client.sendall(part)
+                        time.sleep(0.02)
+                    self.assertEqual(_recv_acks(client, 1), ids[2:3])
+
+                    # Frame larger than the initial receive buffer
+                    big = _frame(_hl7(ids[3], big_obx))
+                    self.assertGreater(len(big), MLLPServer.RECV_BUFFER_SIZE)
+                    client.sendall(big)
+                    self.assertEqual(_recv_acks(client, 1), ids[3:])
+
+                self.assertEqual(self._control_ids(server), ids)
+                if lazy_parse:
+                    self.assertEqual(len(server.messages[3].find_segments('OBX')), 5000)
+                else:
+                    self.assertEqual(len(server.messages[3]['results']), 5000)
+
+    def test_concurrent_clients(self):
+        server, idle = self._start(False)
+        with idle:
+            # An idle sender holding a partial frame must not block the others
+            idle.sendall(SB + b'MSH|^~\\&|Lab')
+
+            results = {}
+
+            def send(n):
+                with socket.create_connection(('127.0.0.1', server.port), timeout=5) as sock:
+                    control_ids = [f"C{n}-{k}" for k in range(3)]
+                    sock.sendall(b''.join(_frame(_hl7(c)) for c in control_ids))
+                    results[n] = (control_ids, _recv_acks(sock, 3))
+
+            threads = [threading.Thread(target=send, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(10)
+
+            self.assertEqual(len(results), 8)
+            for sent, acked in results.values():
+                self.assertEqual(acked, sent)
+            self.assertEqual(len(server.messages), 24)
+
+            # The idle sender can still complete its message
+            idle.sendall(b'|Fac|Grok|Fac|20251128||ADT^A01|IDLE|P|2.5\r' + EB + CR)
+            self.assertEqual(_recv_acks(idle, 1), ['IDLE'])
+
+
+if __name__ == '__main__':
+    unittest.main()
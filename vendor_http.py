@@ -0,0 +1,44 @@
+"""
+Shared HTTP connection pool for vendor LLM clients
+One keep-alive pool (HTTP/2 when the h2 package is installed) reused by the
+OpenAI / Azure OpenAI / Anthropic SDK clients instead of one pool per SDK client.
+"""
+
+import threading
+from typing import Optional
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (httpx[http2] extra)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+VENDOR_MAX_CONNECTIONS = 64
+VENDOR_MAX_KEEPALIVE = 32
+
+# Process-wide pool; connections are per host, so vendors share it safely
+_vendor_http_client: Optional["httpx.Client"] = None
+_vendor_http_client_lock = threading.Lock()
+
+def get_vendor_http_client() -> Optional["httpx.Client"]:
+    """httpx client for an SDK's http_client= argument (None keeps the SDK default)"""
+    global _vendor_http_client
+    if httpx is None:
+        return None
+    if _vendor_http_client is None:
+        with _vendor_http_client_lock:
+            if _vendor_http_client is None:
+                _vendor_http_client = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=VENDOR_MAX_CONNECTIONS,
+                        max_keepalive_connections=VENDOR_MAX_KEEPALIVE
+                    ),
+                    follow_redirects=True
+                )
+    return _vendor_http_client